@@ -4,11 +4,13 @@ import datetime
 from dateutil.relativedelta import relativedelta
 from typing import Dict, Any
 
-# Try to import pandasql for SQL-like queries
-try:
-    from pandasql import sqldf
-except ImportError:
-    sqldf = None
+def _load_sqldf():
+    """Imports pandasql for SQL-like queries on first use; it is optional and slow to import."""
+    try:
+        from pandasql import sqldf
+    except ImportError:
+        return None
+    return sqldf
 
 # -------------------- Helper Functions --------------------
 def _validate_column(df: pd.DataFrame, column: str, operation: str) -> bool:
@@ -223,6 +225,7 @@ def apply_data_validation(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFr
 def apply_sql_query(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
     if "sql_query" in config and config["sql_query"].get("query"):
         query = config["sql_query"].get("query")
+        sqldf = _load_sqldf()
         if sqldf is not None:
             try:
                 df = sqldf(query, locals())
@@ -239,6 +242,16 @@ def calculate_npv(rate, cashflows):
         npv += cf / ((1 + rate) ** t)
     return npv
 
+def calculate_irr(cashflows):
+    # numpy.irr was removed in NumPy 1.20; this is its algorithm. The rate is 1/x - 1 for the
+    # positive real roots x of the cashflow polynomial, taking the one closest to zero.
+    roots = np.roots(np.asarray(cashflows, dtype=float)[::-1])
+    roots = roots[(roots.imag == 0) & (roots.real > 0)].real
+    if roots.size == 0:
+        return np.nan
+    rates = 1 / roots - 1
+    return rates.item(np.argmin(np.abs(rates)))
+
 def apply_financial_calculations(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
     df = df.copy()
     if "financial_calculations" in config:
@@ -255,7 +268,7 @@ def apply_financial_calculations(df: pd.DataFrame, config: Dict[str, Any]) -> pd
             output_col = fc_conf.get("output_column", "IRR")
             if _validate_column(df, cashflow_col, "IRR"):
                 try:
-                    df[output_col] = df[cashflow_col].apply(lambda x: np.irr(x) if isinstance(x, (list, tuple)) else None)
+                    df[output_col] = df[cashflow_col].apply(lambda x: calculate_irr(x) if isinstance(x, (list, tuple)) else None)
                 except Exception:
                     df[output_col] = None
     return df
@@ -1,4 +1,6 @@
+import os
 import pandas as pd
+from excel_ingest import excel_engine
 
 def merge_join_dataframes(dfs, join_type, base_key, other_keys):
 
@@ -35,3 +37,61 @@ def union_dataframes(dfs, union_all=False):
         return concatenated
     else:
         return concatenated.drop_duplicates().reset_index(drop=True)
+
+def read_secondary_file(path):
+    """Reads the second file of a Join/Union step (CSV/TXT, Excel, otherwise CSV)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".csv", ".txt"]:
+        return pd.read_csv(path)
+    elif ext in [".xlsx", ".xls"]:
+        return pd.read_excel(path, engine=excel_engine())
+    return pd.read_csv(path)
+
+def apply_join_and_union(df, transformations, summary_list):
+    """
+    Applies the "Join Dataframes" and "Union Dataframes" steps of a config, appending
+    to summary_list. A failing step is skipped and reported instead of raised, so the
+    rest of the result is still usable. Returns (df, errors) with errors as (title, message).
+    """
+    errors = []
+    if "Join Dataframes" in transformations:
+        params = transformations["Join Dataframes"]
+        join_file = params.get("file_path")
+        if join_file:
+            try:
+                second_df = read_secondary_file(join_file)
+                df = merge_join_dataframes(
+                    [df, second_df],
+                    params["join_type"],
+                    params["base_key"],
+                    [params["other_key"]],
+                )
+                summary_list.append({
+                    "transformation": "Join Dataframes",
+                    "sequence": 9999,
+                    "initial_count": None,
+                    "new_count": len(df),
+                })
+            except Exception as e:
+                errors.append(("Join Error", f"Error joining data:\n{str(e)}"))
+    if "Union Dataframes" in transformations:
+        params = transformations["Union Dataframes"]
+        union_file = params.get("file_path")
+        if union_file:
+            try:
+                second_df = read_secondary_file(union_file)
+                if len(df.columns) != len(second_df.columns):
+                    raise ValueError(
+                        "Union requires dataframes to have the same number of columns.\n"
+                        f"Base has {len(df.columns)} columns, second DF has {len(second_df.columns)}."
+                    )
+                df = union_dataframes([df, second_df], params.get("union_all", False))
+                summary_list.append({
+                    "transformation": "Union Dataframes",
+                    "sequence": 9999,
+                    "initial_count": None,
+                    "new_count": len(df),
+                })
+            except Exception as e:
+                errors.append(("Union Error", f"Error unioning data:\n{str(e)}"))
+    return df, errors
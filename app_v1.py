@@ -12,7 +12,6 @@ import pandas as pd
 from advanced_excel_transformations import *
 from advanced_transformations import *
 from transformations import *
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication, QLabel
 from PyQt6.QtWidgets import (
@@ -20,14 +19,23 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QTabWidget, QComboBox, QSpinBox, QLineEdit, QTableView,
     QAbstractItemView, QGroupBox, QFileDialog, QDialog, QMessageBox, QSplitter,
     QHeaderView, QProgressDialog, QStatusBar, QStackedWidget, QRadioButton,
-    QPlainTextEdit, QFormLayout, QListWidget, QListWidgetItem, QLayout, QInputDialog,QDialogButtonBox
+    QPlainTextEdit, QFormLayout, QListWidget, QListWidgetItem, QLayout, QInputDialog, QCheckBox,QDialogButtonBox
 )
-from lineage import show_enhanced_lineage_in_ui
 from ui_helpers import *
 from ui_dialogs_data_cleaning import *
 from ui_dialogs_data_transformation import *
 from ui_dialogs_data_reshaping import *
 from ui_dialogs_agg_sort import SortDataDialog
+from step_cache import StepResultCache, preview_sample
+from pipeline_worker import PipelineWorker, TaskWorker, ExportWorker
+from exporter import export_file_filter, export_path_for
+from pipeline_manager import required_source_columns
+from csv_ingest import read_csv_fast
+from excel_ingest import excel_engine, excel_sheet_names
+from raw_tables import RAW_TABLE_EXTENSIONS, read_with_header
+from arrow_loading import ARROW_IPC_EXTENSIONS, mapped_loading_enabled, read_mapped
+from dtype_optimizer import optimize_dtypes, apply_dtype_plan
+from predicate_pushdown import source_column_names
 
 class ExcelAdvancedConfigDialog(QDialog):
     def __init__(self, current_config=None, columns=None, parent=None):
@@ -287,7 +295,7 @@ class JoinDataframesDialog(QDialog):
                 if ext in [".csv", ".txt"]:
                     df = pd.read_csv(path, nrows=1)
                 elif ext in [".xlsx", ".xls"]:
-                    df = pd.read_excel(path, nrows=1)
+                    df = pd.read_excel(path, nrows=1, engine=excel_engine())
                 else:
                     df = pd.read_csv(path, nrows=1)
                 self.second_key_combo.clear()
@@ -362,11 +370,15 @@ class DataTransformerTool(QMainWindow):
             "original_df": None,
             "df": None,
             "header_row": 0,
+            "sheet_name": None,
+            "delimiter": ",",
             "filter_conditions": [],
             "transformation_params": {},
             "advanced_excel_config": {},
             "loaded_config": None,
+            "column_dtypes": {},
             "transformation_summary": None,
+            "result_is_preview": False,
             "pipeline_steps": []
         }
         self.pipeline_loaded = False
@@ -374,6 +386,12 @@ class DataTransformerTool(QMainWindow):
         self.column_registry = {}
         self.friendly_columns = []
         self.lineage_network = None
+        self.step_cache = StepResultCache()
+        self.pipeline_worker = None
+        self.run_generation = 0
+        self.active_workers = set()
+        self.preview_mode = True
+        self.preview_source = None  # (original_df, sample) so the sample object is reused between runs
         self.initUI()
 
     def addPipelineStep(self, trans_name, parameters):
@@ -400,6 +418,10 @@ class DataTransformerTool(QMainWindow):
         main_layout.addWidget(splitter)
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
+        self.cancel_run_btn = QPushButton("Cancel Run")
+        self.cancel_run_btn.setEnabled(False)
+        self.cancel_run_btn.clicked.connect(self.cancelPipelineRun)
+        self.status_bar.addPermanentWidget(self.cancel_run_btn)
         bottom_bar = QWidget()
         bottom_bar.setFixedHeight(40)
         bottom_bar.setStyleSheet("background-color: #333; color: white;")
@@ -639,6 +661,9 @@ class DataTransformerTool(QMainWindow):
         btn_analytical = QPushButton("Configure Analytical Functions 📝")
         btn_analytical.clicked.connect(self.configureAnalyticalFunctions)
         vb_analytical.addWidget(btn_analytical)
+        btn_window = QPushButton("Configure Window Functions 🪟")
+        btn_window.clicked.connect(self.configureWindowFunctions)
+        vb_analytical.addWidget(btn_window)
         layout.addWidget(gbox_analytical)
         layout.addStretch()
 
@@ -687,10 +712,9 @@ class DataTransformerTool(QMainWindow):
         label_title.setStyleSheet("font-size: 24px; font-weight: bold;")
         self.right_layout.addWidget(label_title)
         self.table_view = QTableView()
-        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         self.model = PandasModel(pd.DataFrame())
         self.table_view.setModel(self.model)
-        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.right_layout.addWidget(self.table_view)
         integrated_buttons_layout = QHBoxLayout()
         download_data_btn = QPushButton("Download Data")
@@ -699,6 +723,17 @@ class DataTransformerTool(QMainWindow):
         summary_btn.clicked.connect(self.showTransformationSummary)
         lineage_btn = QPushButton("Lineage Diagram")
         lineage_btn.clicked.connect(self.showLineagePopout)
+        run_full_btn = QPushButton("Run Full")
+        run_full_btn.setToolTip("Run the pipeline on every row instead of the preview sample.")
+        run_full_btn.clicked.connect(self.runFullPipeline)
+        self.preview_check = QCheckBox("Sample preview")
+        self.preview_check.setChecked(self.preview_mode)
+        self.preview_check.toggled.connect(self.onPreviewModeToggled)
+        self.dtype_check = QCheckBox("Optimize dtypes")
+        self.dtype_check.setToolTip("Store low-cardinality text columns as categories and other text as Arrow strings when a file is loaded.")
+        integrated_buttons_layout.addWidget(self.preview_check)
+        integrated_buttons_layout.addWidget(self.dtype_check)
+        integrated_buttons_layout.addWidget(run_full_btn)
         integrated_buttons_layout.addWidget(download_data_btn)
         integrated_buttons_layout.addWidget(summary_btn)
         integrated_buttons_layout.addWidget(lineage_btn)
@@ -823,11 +858,13 @@ class DataTransformerTool(QMainWindow):
             friendly_config["having"] = convert_tuple_keys_to_str(
                 self.state["transformation_params"].get("having", {})
         )        
+        # pyvis, jinja2 and QtWebEngine are only needed once a diagram is shown.
+        from lineage import show_enhanced_lineage_in_ui
         show_enhanced_lineage_in_ui(friendly_config, self.master_registry)
 
     def updatePreview(self, df):
         self.model.setDataFrame(df)
-        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        resize_columns_from_sample(self.table_view)
 
     def _readFile(self, path, ext, header):
         try:
@@ -835,29 +872,41 @@ class DataTransformerTool(QMainWindow):
                 delimiter, ok = QInputDialog.getText(self, "Specify Delimiter", "Enter delimiter for text file:", text=",")
                 if not ok:
                     delimiter = ","
-                return pd.read_csv(path, delimiter=delimiter, header=header)
+                return read_with_header(path, header, delimiter=delimiter)
             elif ext in [".xlsx", ".xls"]:
                 # Only ask for sheet name if not already set
-                if "sheet_name" not in self.state or self.state["sheet_name"] is None:
+                if self.state.get("sheet_name") is None:
                     sheet_name, ok = QInputDialog.getText(self, "Select Sheet", "Enter sheet name (leave blank for first sheet):")
                     if not ok or sheet_name.strip() == "":
                         sheet_name = 0
                     self.state["sheet_name"] = sheet_name
                 else:
                     sheet_name = self.state["sheet_name"]
-                return pd.read_excel(path, sheet_name=sheet_name, header=header)
-            elif ext == ".parquet":
-                return pd.read_parquet(path)
+                return read_with_header(path, header, sheet_name=sheet_name)
+            elif ext == ".parquet" or ext in ARROW_IPC_EXTENSIONS:
+                if mapped_loading_enabled():
+                    return read_mapped(path)
+                return pd.read_parquet(path) if ext == ".parquet" else read_mapped(path, arrow_dtypes=False)
             elif ext == ".json":
                 return normalize_json(path)
             elif ext == ".xml":
                 return pd.read_xml(path)
             else:
-                return pd.read_csv(path, header=header)
+                return read_csv_fast(path, header=header)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not read file:\n{str(e)}")
             return pd.DataFrame()
         
+    def _readWithHeader(self, header):
+        """
+        Reads the loaded file again with a new header row. Excel sheets are re-sliced from
+        their cached raw rows and CSV/TXT files re-parsed from their cached bytes (see raw_tables).
+        """
+        path, ext = self.state["file_path"], self.state["file_ext"]
+        if ext in RAW_TABLE_EXTENSIONS:
+            return read_with_header(path, header, delimiter=self.state["delimiter"], sheet_name=self.state["sheet_name"] or 0)
+        return self._readFile(path, ext, header)
+
     def onSetHeaderClicked(self):
         if not self.state["file_path"]:
             QMessageBox.warning(self, "No File", "Load a file first.")
@@ -866,7 +915,7 @@ class DataTransformerTool(QMainWindow):
         self.state["header_row"] = new_header
         try:
             old_registry = self.column_registry.copy()
-            df = self._readFile(self.state["file_path"], self.state["file_ext"], new_header)
+            df = self._readWithHeader(new_header)
             self.friendly_columns = df.columns.tolist()
             self.master_registry.clear()
             self.column_registry.clear()
@@ -888,6 +937,7 @@ class DataTransformerTool(QMainWindow):
                                 cond["column"] = self.column_registry[key]
                                 break
             self.state["original_df"] = df.copy()
+            self.step_cache.clear()
             self.applyAllTransformationsAndRefresh()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Reload file failed:\n{str(e)}")
@@ -925,6 +975,8 @@ class DataTransformerTool(QMainWindow):
                 "Advanced Excel Functions": self.state["advanced_excel_config"],
                 "Column Registry": self.original_registry 
             }
+            if self.state["column_dtypes"]:
+                config["Column Dtypes"] = self.state["column_dtypes"]
         else:
             trans_config = self.state["transformation_params"].copy()
 
@@ -945,6 +997,8 @@ class DataTransformerTool(QMainWindow):
                 "Advanced Excel Functions": self.state["advanced_excel_config"],
                 "Column Registry": self.original_registry  # Save mapping info here
             }
+            if self.state["column_dtypes"]:
+                config["Column Dtypes"] = self.state["column_dtypes"]
 
         path, _ = QFileDialog.getSaveFileName(self, "Save Pipeline Config", "", "JSON Files (*.json)")
         if path:
@@ -966,7 +1020,7 @@ class DataTransformerTool(QMainWindow):
                 self.spin_header.setValue(self.state["header_row"])
 
                 if self.state["file_path"]:
-                    df = self._readFile(self.state["file_path"], self.state["file_ext"], self.state["header_row"])
+                    df = self._readWithHeader(self.state["header_row"])
                     self.friendly_columns = df.columns.tolist()
                     self.master_registry.clear()
                     self.column_registry.clear()
@@ -979,6 +1033,7 @@ class DataTransformerTool(QMainWindow):
                     df.columns = new_cols
                     self.original_registry = self.master_registry.copy()
                     self.state["original_df"] = df.copy()
+                    self.step_cache.clear()
                 
                 self.state["filter_conditions"] = config.get("Filters", [])
                 if "Pipeline Steps" in config:
@@ -988,6 +1043,10 @@ class DataTransformerTool(QMainWindow):
                     self.state["transformation_params"] = config.get("Transformations", {})
                     self.pipeline_loaded = False
                 self.state["advanced_excel_config"] = config.get("Advanced Excel Functions", {})
+                self.state["column_dtypes"] = config.get("Column Dtypes", {})
+                if self.state["column_dtypes"] and self.state["original_df"] is not None:
+                    self.state["original_df"] = apply_dtype_plan(self.state["original_df"], self.state["column_dtypes"])
+                    self.step_cache.clear()
                 
                 saved_registry = config.get("Column Registry", {})
                 saved_friendly = set(saved_registry.values())
@@ -1013,108 +1072,6 @@ class DataTransformerTool(QMainWindow):
                 QMessageBox.information(self, "Success", "Pipeline loaded successfully.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error loading pipeline:\n{str(e)}")
-    
-    def applyAllTransformationsAndRefresh(self):
-        if self.state["original_df"] is None:
-            self.updatePreview(pd.DataFrame())
-            return
-        df = self.state["original_df"].copy()
-        if self.pipeline_loaded:
-            transformations = {}
-            for step in sorted(self.state["pipeline_steps"], key=lambda x: x["order"]):
-                transformations[step["transformation"]] = step["parameters"]
-        else:
-            transformations = self.state["transformation_params"]
-        config = {
-            "Header Row": self.state["header_row"],
-            "Filters": self.state["filter_conditions"],
-            "Transformations": transformations,
-            "Advanced Excel Functions": self.state["advanced_excel_config"],
-        }
-        try:
-            df_transformed, summary_list = apply_transformations_with_summary(df, config)
-            df_transformed = apply_advanced_excel_transformations(df_transformed, config["Advanced Excel Functions"])
-            if "Join Dataframes" in config["Transformations"]:
-                params = config["Transformations"]["Join Dataframes"]
-                join_file = params.get("file_path")
-                if join_file:
-                    try:
-                        ext = os.path.splitext(join_file)[1].lower()
-                        if ext in [".csv", ".txt"]:
-                            second_df = pd.read_csv(join_file)
-                        elif ext in [".xlsx", ".xls"]:
-                            second_df = pd.read_excel(join_file)
-                        else:
-                            second_df = pd.read_csv(join_file)
-                        df_transformed = merge_join_dataframes(
-                            [df_transformed, second_df],
-                            params["join_type"],
-                            params["base_key"],
-                            [params["other_key"]],
-                        )
-                        summary_list.append({
-                            "transformation": "Join Dataframes",
-                            "sequence": 9999,
-                            "initial_count": None,
-                            "new_count": len(df_transformed),
-                        })
-                    except Exception as e:
-                        QMessageBox.critical(self, "Join Error", f"Error joining data:\n{str(e)}")
-            if "Union Dataframes" in config["Transformations"]:
-                params = config["Transformations"]["Union Dataframes"]
-                union_file = params.get("file_path")
-                if union_file:
-                    try:
-                        ext = os.path.splitext(union_file)[1].lower()
-                        if ext in [".csv", ".txt"]:
-                            second_df = pd.read_csv(union_file)
-                        elif ext in [".xlsx", ".xls"]:
-                            second_df = pd.read_excel(union_file)
-                        else:
-                            second_df = pd.read_csv(union_file)
-                        base_cols = list(df_transformed.columns)
-                        second_cols = list(second_df.columns)
-                        if len(base_cols) != len(second_cols):
-                            msg = (
-                                "Union requires dataframes to have the same number of columns.\n"
-                                f"Base has {len(base_cols)} columns, second DF has {len(second_cols)}."
-                            )
-                            QMessageBox.warning(self, "Union Warning", msg)
-                            raise ValueError(msg)
-                        union_all = params.get("union_all", False)
-                        df_transformed = union_dataframes([df_transformed, second_df], union_all)
-                        summary_list.append({
-                            "transformation": "Union Dataframes",
-                            "sequence": 9999,
-                            "initial_count": None,
-                            "new_count": len(df_transformed),
-                        })
-                    except Exception as e:
-                        QMessageBox.critical(self, "Union Error", f"Error unioning data:\n{str(e)}")
-            self.state["df"] = df_transformed
-            self.state["transformation_summary"] = summary_list
-            existing_cols = set(df_transformed.columns)
-            self.column_registry = {cid: self.master_registry[cid] for cid in self.master_registry if cid in existing_cols}
-            display_df = df_transformed.copy()
-            display_df.columns = [internal_to_friendly(col, self.master_registry) for col in display_df.columns]
-            self.updatePreview(display_df)
-
-            rc = len(df_transformed)
-            self.status_bar.showMessage(f"Row count: {rc}", 5000)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not apply transformations:\n{str(e)}")
-
-    def openSimpleDialog(self, title, fields):
-        dlg = GenericTransformationDialog(list(self.column_registry.values()), self.column_registry,
-                                          param_defs=fields, dialog_title=f"Configure {title}")
-        dlg.setMinimumSize(600, 400)
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            params = dlg.getValues()
-            if self.pipeline_loaded:
-                self.addPipelineStep(title, params)
-            else:
-                self.state["transformation_params"][title] = params
-            self.applyAllTransformationsAndRefresh()
 
     def configureFilters(self):
         if self.state["df"] is None:
@@ -1649,6 +1606,19 @@ class DataTransformerTool(QMainWindow):
                 self.state["transformation_params"]["Analytical Functions"] = dlg.getValues()
             self.applyAllTransformationsAndRefresh()
 
+    def configureWindowFunctions(self):
+        if not self.state["file_path"]:
+            QMessageBox.warning(self, "No File", "Load a file first.")
+            return
+        dlg = WindowFunctionsDialog(list(self.column_registry.values()), self.column_registry, self.state["transformation_params"].get("Window Functions", {}), self)
+        dlg.setMinimumSize(700, 400)
+        if dlg.exec() == QDialog.DialogCode.Accepted:
+            if self.pipeline_loaded:
+                self.addPipelineStep("Window Functions", dlg.getValues())
+            else:
+                self.state["transformation_params"]["Window Functions"] = dlg.getValues()
+            self.applyAllTransformationsAndRefresh()
+
     # ------------------ New Configuration Methods for Excel Functions ------------------
     def configureLeft(self):
         self.openSimpleDialog("LEFT", [{"name": "column", "label": "Column", "type": "str"},
@@ -1805,12 +1775,14 @@ class DataTransformerTool(QMainWindow):
     def loadDataFile(self):
         self.spin_header.setValue(0)
         self.state["header_row"] = 0
+        self.state["sheet_name"] = None
         dlg = QFileDialog(self, "Select Data File")
         dlg.setNameFilters([
             "CSV Files (*.csv)",
             "Text Files (*.txt)",
             "Excel Files (*.xlsx *.xls)",
             "Parquet Files (*.parquet)",
+            "Arrow/Feather Files (*.feather *.arrow)",
             "JSON Files (*.json)",
             "XML Files (*.xml)",
             "All Files (*.*)"
@@ -1823,264 +1795,145 @@ class DataTransformerTool(QMainWindow):
             self.state["file_path"] = path
             file_size = os.path.getsize(path)
             threshold = 1 * 1024 * 1024  # 1 MB
-            if file_size > threshold and not path.lower().endswith('.parquet'):
-                progress = QProgressDialog("Converting large file to Parquet...", None, 0, 0, self)
-                progress.setWindowModality(Qt.WindowModal)
+            if file_size > threshold and not path.lower().endswith(('.parquet',) + ARROW_IPC_EXTENSIONS):
+                # In mapped mode the cached copy is uncompressed Feather, shared through the page cache.
+                mapped = mapped_loading_enabled()
+                progress = QProgressDialog(f"Converting large file to {'Feather' if mapped else 'Parquet'}...", None, 0, 0, self)
+                progress.setWindowModality(Qt.WindowModality.WindowModal)
+                worker = TaskWorker(convert_to_feather if mapped else convert_to_parquet, path, header=self.spin_header.value())
+
+                def on_converted(converted_path):
+                    progress.close()
+                    self._finishLoadDataFile(converted_path)
+
+                def on_failed(message):
+                    progress.close()
+                    QMessageBox.critical(self, "Error", f"Could not convert file:\n{message}")
+
+                worker.result_ready.connect(on_converted)
+                worker.failed.connect(on_failed)
                 progress.show()
-                QApplication.processEvents()
-                path = convert_to_parquet(path, header=self.spin_header.value())
-                progress.close()
-            self.state["file_ext"] = os.path.splitext(path)[1].lower()
-            try:
-                if self.state["file_ext"] in [".csv", ".txt"]:
-                    delimiter, ok = QInputDialog.getText(self, "Specify Delimiter", "Enter delimiter for text file:", text=",")
-                    if not ok:
-                        delimiter = ","
-                    df = pd.read_csv(path, delimiter=delimiter, header=self.spin_header.value())
-                elif self.state["file_ext"] in [".xlsx", ".xls"]:
-                    # Only ask for sheet selection if not already set
-                    if "sheet_name" not in self.state:
-                        # Get the list of sheets in the Excel file
-                        excel_file = pd.ExcelFile(path)
-                        sheet_names = excel_file.sheet_names
-                        sheet_dialog = QDialog(self)
-                        sheet_dialog.setWindowTitle("Select Sheet")
-                        layout = QVBoxLayout(sheet_dialog)
-                        sheet_label = QLabel("Select a sheet to load:")
-                        layout.addWidget(sheet_label)
-                        sheet_combo = QComboBox()
-                        sheet_combo.addItems(sheet_names)
-                        layout.addWidget(sheet_combo)
-                        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-                        button_box.accepted.connect(sheet_dialog.accept)
-                        button_box.rejected.connect(sheet_dialog.reject)
-                        layout.addWidget(button_box)
-                        sheet_dialog.setLayout(layout)
-    
-                        if sheet_dialog.exec() == QDialog.DialogCode.Accepted:
-                            selected_sheet = sheet_combo.currentText()
-                            self.state["sheet_name"] = selected_sheet  # Save sheet name for later use
-                        else:
-                            return  # User canceled the sheet selection
-                    else:
-                        selected_sheet = self.state["sheet_name"]
-                    df = pd.read_excel(path, sheet_name=selected_sheet, header=self.spin_header.value())
-                elif self.state["file_ext"] == ".parquet":
-                    df = pd.read_parquet(path)
-                elif self.state["file_ext"] == ".json":
-                    df = normalize_json(path)
-                elif self.state["file_ext"] == ".xml":
-                    df = pd.read_xml(path)
-                else:
-                    df = pd.read_csv(path, header=self.spin_header.value())
-    
-                self.friendly_columns = df.columns.tolist()
-                self.master_registry.clear()
-                self.column_registry.clear()
-                new_cols = []
-                for i, col in enumerate(self.friendly_columns):
-                    cid = f"col_{i+1}"
-                    self.master_registry[cid] = str(col)
-                    self.column_registry[cid] = str(col)
-                    new_cols.append(cid)
-                df.columns = new_cols
-                self.original_registry = self.master_registry.copy()
-                self.state["original_df"] = df.copy()
-                if not self.state.get("loaded_config"):
-                    self.state["filter_conditions"] = []
-                    self.state["transformation_params"] = {}
-                    self.state["advanced_excel_config"] = {}
-                    self.state["pipeline_steps"] = []
-                    self.pipeline_loaded = False
-                self.applyAllTransformationsAndRefresh()
-                QMessageBox.information(self, "Success", "Data file loaded successfully.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not read file:\n{str(e)}")
-            
-    def applyAllTransformationsAndRefresh(self):
-        if self.state["original_df"] is None:
-            self.updatePreview(pd.DataFrame())
-            return
-        df = self.state["original_df"].copy()
-        if self.pipeline_loaded:
-            transformations = {}
-            for step in sorted(self.state["pipeline_steps"], key=lambda x: x["order"]):
-                transformations[step["transformation"]] = step["parameters"]
-        else:
-            transformations = self.state["transformation_params"]
+                self._startWorker(worker)
+                return
+            self._finishLoadDataFile(path)
+
+    def _requiredColumnPositions(self, path, ext, header, delimiter=","):
+        """
+        Source column positions the pipeline loaded before this file needs, or None to read
+        every column (no pipeline loaded, a format without a cheap header read, or nothing to skip).
+        """
+        if not self.state.get("loaded_config") or ext not in [".csv", ".txt", ".parquet", *ARROW_IPC_EXTENSIONS]:
+            return None
+        names = source_column_names(path, header, delimiter)
         config = {
-            "Header Row": self.state["header_row"],
             "Filters": self.state["filter_conditions"],
-            "Transformations": transformations,
             "Advanced Excel Functions": self.state["advanced_excel_config"],
         }
+        if self.pipeline_loaded:
+            config["Pipeline Steps"] = self.state["pipeline_steps"]
+        else:
+            config["Transformations"] = self.state["transformation_params"]
+        positions = required_source_columns(config, len(names))
+        if len(positions) == len(names):
+            return None
+        logging.info("Reading %d of %d columns used by the loaded pipeline", len(positions), len(names))
+        return positions
+
+    def _optimizeLoadedDtypes(self, df):
+        """
+        Applies the dtypes saved with a loaded pipeline, or infers smaller ones when
+        'Optimize dtypes' is checked. Returns the frame and a note for the load message.
+        """
+        plan = self.state["column_dtypes"] if self.state.get("loaded_config") else {}
+        if plan:
+            return apply_dtype_plan(df, plan), ""
+        if not self.dtype_check.isChecked():
+            self.state["column_dtypes"] = {}
+            return df, ""
+        df, plan, (before, after) = optimize_dtypes(df)
+        self.state["column_dtypes"] = plan
+        return df, f"\nOptimized {len(plan)} column dtypes: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB in memory."
+
+    def _finishLoadDataFile(self, path):
+        self.state["file_ext"] = os.path.splitext(path)[1].lower()
+        positions = None
         try:
-            df_transformed, summary_list = apply_transformations_with_summary(df, config)
-            df_transformed = apply_advanced_excel_transformations(df_transformed, config["Advanced Excel Functions"])
-            if "Join Dataframes" in config["Transformations"]:
-                params = config["Transformations"]["Join Dataframes"]
-                join_file = params.get("file_path")
-                if join_file:
-                    try:
-                        ext = os.path.splitext(join_file)[1].lower()
-                        if ext in [".csv", ".txt"]:
-                            second_df = pd.read_csv(join_file)
-                        elif ext in [".xlsx", ".xls"]:
-                            second_df = pd.read_excel(join_file)
-                        else:
-                            second_df = pd.read_csv(join_file)
-                        df_transformed = merge_join_dataframes(
-                            [df_transformed, second_df],
-                            params["join_type"],
-                            params["base_key"],
-                            [params["other_key"]],
-                        )
-                        summary_list.append({
-                            "transformation": "Join Dataframes",
-                            "sequence": 9999,
-                            "initial_count": None,
-                            "new_count": len(df_transformed),
-                        })
-                    except Exception as e:
-                        QMessageBox.critical(self, "Join Error", f"Error joining data:\n{str(e)}")
-            if "Union Dataframes" in config["Transformations"]:
-                params = config["Transformations"]["Union Dataframes"]
-                union_file = params.get("file_path")
-                if union_file:
-                    try:
-                        ext = os.path.splitext(union_file)[1].lower()
-                        if ext in [".csv", ".txt"]:
-                            second_df = pd.read_csv(union_file)
-                        elif ext in [".xlsx", ".xls"]:
-                            second_df = pd.read_excel(union_file)
-                        else:
-                            second_df = pd.read_csv(union_file)
-                        base_cols = list(df_transformed.columns)
-                        second_cols = list(second_df.columns)
-                        if len(base_cols) != len(second_cols):
-                            msg = (
-                                "Union requires dataframes to have the same number of columns.\n"
-                                f"Base has {len(base_cols)} columns, second DF has {len(second_cols)}."
-                            )
-                            QMessageBox.warning(self, "Union Warning", msg)
-                            raise ValueError(msg)
-                        union_all = params.get("union_all", False)
-                        df_transformed = union_dataframes([df_transformed, second_df], union_all)
-                        summary_list.append({
-                            "transformation": "Union Dataframes",
-                            "sequence": 9999,
-                            "initial_count": None,
-                            "new_count": len(df_transformed),
-                        })
-                    except Exception as e:
-                        QMessageBox.critical(self, "Union Error", f"Error unioning data:\n{str(e)}")
-            self.state["df"] = df_transformed
-            self.state["transformation_summary"] = summary_list
-            existing_cols = set(df_transformed.columns)
-            self.column_registry = {cid: self.master_registry[cid] for cid in self.master_registry if cid in existing_cols}
-            display_df = df_transformed.copy()
-            display_df.columns = [internal_to_friendly(col, self.master_registry) for col in display_df.columns]
-            self.updatePreview(display_df)
-            rc = len(df_transformed)
-            self.status_bar.showMessage(f"Row count: {rc}", 5000)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not apply transformations:\n{str(e)}")
-
-    def openSimpleDialog(self, title, fields):
-        dlg = GenericTransformationDialog(list(self.column_registry.values()), self.column_registry,
-                                          param_defs=fields, dialog_title=f"Configure {title}")
-        dlg.setMinimumSize(600, 400)
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            params = dlg.getValues()
-            if self.pipeline_loaded:
-                self.addPipelineStep(title, params)
+            if self.state["file_ext"] in [".csv", ".txt"]:
+                delimiter, ok = QInputDialog.getText(self, "Specify Delimiter", "Enter delimiter for text file:", text=",")
+                if not ok:
+                    delimiter = ","
+                self.state["delimiter"] = delimiter
+                positions = self._requiredColumnPositions(path, self.state["file_ext"], self.spin_header.value(), delimiter)
+                df = read_with_header(path, self.spin_header.value(), delimiter=delimiter, usecols=positions)
+            elif self.state["file_ext"] in [".xlsx", ".xls"]:
+                # Only ask for sheet selection if not already set
+                if self.state.get("sheet_name") is None:
+                    # Get the list of sheets in the Excel file
+                    sheet_names = excel_sheet_names(path)
+                    sheet_dialog = QDialog(self)
+                    sheet_dialog.setWindowTitle("Select Sheet")
+                    layout = QVBoxLayout(sheet_dialog)
+                    sheet_label = QLabel("Select a sheet to load:")
+                    layout.addWidget(sheet_label)
+                    sheet_combo = QComboBox()
+                    sheet_combo.addItems(sheet_names)
+                    layout.addWidget(sheet_combo)
+                    button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+                    button_box.accepted.connect(sheet_dialog.accept)
+                    button_box.rejected.connect(sheet_dialog.reject)
+                    layout.addWidget(button_box)
+                    sheet_dialog.setLayout(layout)
+
+                    if sheet_dialog.exec() == QDialog.DialogCode.Accepted:
+                        selected_sheet = sheet_combo.currentText()
+                        self.state["sheet_name"] = selected_sheet  # Save sheet name for later use
+                    else:
+                        return  # User canceled the sheet selection
+                else:
+                    selected_sheet = self.state["sheet_name"]
+                df = read_with_header(path, self.spin_header.value(), sheet_name=selected_sheet)
+            elif self.state["file_ext"] == ".parquet" or self.state["file_ext"] in ARROW_IPC_EXTENSIONS:
+                positions = self._requiredColumnPositions(path, self.state["file_ext"], self.spin_header.value())
+                columns = None if positions is None else [source_column_names(path)[pos] for pos in positions]
+                if mapped_loading_enabled():
+                    df = read_mapped(path, columns=columns)
+                elif self.state["file_ext"] == ".parquet":
+                    df = pd.read_parquet(path, columns=columns)
+                else:
+                    df = read_mapped(path, columns=columns, arrow_dtypes=False)
+            elif self.state["file_ext"] == ".json":
+                df = normalize_json(path)
+            elif self.state["file_ext"] == ".xml":
+                df = pd.read_xml(path)
             else:
-                self.state["transformation_params"][title] = params
-            self.applyAllTransformationsAndRefresh()
+                df = read_csv_fast(path, header=self.spin_header.value())
 
-    # ------------------ New Configuration Methods for Excel Functions ------------------
-    def configureLeft(self):
-        self.openSimpleDialog("LEFT", [{"name": "column", "label": "Column", "type": "str"},
-                                       {"name": "num_chars", "label": "Number of Characters", "type": "int"}])
-    def configureRight(self):
-        self.openSimpleDialog("RIGHT", [{"name": "column", "label": "Column", "type": "str"},
-                                        {"name": "num_chars", "label": "Number of Characters", "type": "int"}])
-    def configureMid(self):
-        self.openSimpleDialog("MID", [{"name": "column", "label": "Column", "type": "str"},
-                                      {"name": "start", "label": "Start Position", "type": "int"},
-                                      {"name": "num_chars", "label": "Number of Characters", "type": "int"}])
-    def configureLen(self):
-        self.openSimpleDialog("LEN", [{"name": "column", "label": "Column", "type": "str"}])
-    def configureDatedif(self):
-        self.openSimpleDialog("DATEDIF", [
-            {"name": "start_date_column", "label": "Start Date Column", "type": "str"},
-            {"name": "end_date_column", "label": "End Date Column", "type": "str"},
-            {"name": "unit", "label": "Unit (days/months/years)", "type": "str"}
-        ])
-    def configureEOMONTH(self):
-        self.openSimpleDialog("EOMONTH", [
-            {"name": "date_column", "label": "Date Column", "type": "str"},
-            {"name": "months", "label": "Month Offset", "type": "int"}
-        ])
-    def configureWeekday(self):
-        self.openSimpleDialog("WEEKDAY", [{"name": "date_column", "label": "Date Column", "type": "str"}])
-    def configureUnique(self):
-        self.openSimpleDialog("Unique", [{"name": "column", "label": "Column", "type": "str"}])
-    def configureSortArray(self):
-        self.openSimpleDialog("Sort Array", [
-            {"name": "column", "label": "Column", "type": "str"},
-            {"name": "ascending", "label": "Ascending (True/False)", "type": "str"}
-        ])
-    def configureNPV(self):
-        self.openSimpleDialog("NPV", [
-            {"name": "discount_rate", "label": "Discount Rate", "type": "float"},
-            {"name": "cashflow_column", "label": "Cashflow Column", "type": "str"}
-        ])
-    def configureIRR(self):
-        self.openSimpleDialog("IRR", [
-            {"name": "cashflow_column", "label": "Cashflow Column", "type": "str"}
-        ])
-    def configurePMT(self):
-        self.openSimpleDialog("PMT", [
-            {"name": "rate", "label": "Rate", "type": "float"},
-            {"name": "nper", "label": "Number of Periods", "type": "int"},
-            {"name": "pv", "label": "Present Value", "type": "float"}
-        ])
-    def configureIF(self):
-        self.openSimpleDialog("IF", [
-            {"name": "column", "label": "Reference Column", "type": "str"},
-            {"name": "condition", "label": "Condition (e.g., df['col'] > 5)", "type": "str"},
-            {"name": "true_value", "label": "True Value", "type": "str"},
-            {"name": "false_value", "label": "False Value", "type": "str"}
-        ])
-    def configureIFERROR(self):
-        self.openSimpleDialog("IFERROR", [
-            {"name": "column", "label": "Reference Column", "type": "str"},
-            {"name": "fallback", "label": "Fallback Value", "type": "str"}
-        ])
-    def configureXLOOKUP(self):
-        self.openSimpleDialog("XLOOKUP", [
-            {"name": "source_column", "label": "Source Column", "type": "str"},
-            {"name": "lookup_table", "label": "Lookup Table (JSON)", "type": "str"},
-            {"name": "lookup_key", "label": "Lookup Key", "type": "str"},
-            {"name": "lookup_value", "label": "Lookup Value", "type": "str"},
-            {"name": "approximate_match", "label": "Approximate Match (True/False)", "type": "str"},
-            {"name": "tolerance", "label": "Tolerance (numeric)", "type": "float"}
-        ])
-    def configureIndexMatch(self):
-        self.openSimpleDialog("INDEX/MATCH", [
-            {"name": "source_column", "label": "Source Column", "type": "str"},
-            {"name": "lookup_table", "label": "Lookup Table (JSON)", "type": "str"},
-            {"name": "lookup_key", "label": "Lookup Key", "type": "str"},
-            {"name": "return_column", "label": "Return Column", "type": "str"},
-            {"name": "approximate_match", "label": "Approximate Match (True/False)", "type": "str"},
-            {"name": "tolerance", "label": "Tolerance (numeric)", "type": "float"}
-        ])
-    def configureTEXTJOIN(self):
-        self.openSimpleDialog("TEXTJOIN", [
-            {"name": "columns", "label": "Columns (comma separated)", "type": "str"},
-            {"name": "delimiter", "label": "Delimiter", "type": "str"}
-        ])
+            self.friendly_columns = df.columns.tolist()
+            self.master_registry.clear()
+            self.column_registry.clear()
+            new_cols = []
+            # Skipped columns keep their ids free, so the loaded pipeline's col_i still line up.
+            for i, col in zip(positions if positions is not None else range(len(self.friendly_columns)),
+                              self.friendly_columns):
+                cid = f"col_{i+1}"
+                self.master_registry[cid] = str(col)
+                self.column_registry[cid] = str(col)
+                new_cols.append(cid)
+            df.columns = new_cols
+            self.original_registry = self.master_registry.copy()
+            df, dtype_note = self._optimizeLoadedDtypes(df)
+            self.state["original_df"] = df.copy()
+            self.step_cache.clear()
+            if not self.state.get("loaded_config"):
+                self.state["filter_conditions"] = []
+                self.state["transformation_params"] = {}
+                self.state["advanced_excel_config"] = {}
+                self.state["pipeline_steps"] = []
+                self.pipeline_loaded = False
+            self.applyAllTransformationsAndRefresh()
+            QMessageBox.information(self, "Success", "Data file loaded successfully." + dtype_note)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read file:\n{str(e)}")
 
     def configureAdvancedLookupConditional(self):
         QMessageBox.information(self, "Advanced Lookup", "Advanced Lookup & Conditional configuration dialog goes here.")
@@ -2100,55 +1953,56 @@ class DataTransformerTool(QMainWindow):
     def configureAdvancedSQL(self):
         QMessageBox.information(self, "Advanced SQL", "Advanced SQL Query configuration dialog goes here.")
 
-    def openSimpleDialog(self, title, fields):
-        dlg = GenericTransformationDialog(list(self.column_registry.values()), self.column_registry,
-                                          param_defs=fields, dialog_title=f"Configure {title}")
-        dlg.setMinimumSize(600, 400)
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            params = dlg.getValues()
-            if self.pipeline_loaded:
-                self.addPipelineStep(title, params)
-            else:
-                self.state["transformation_params"][title] = params
-            self.applyAllTransformationsAndRefresh()
-
     # ---------------------- Download/Preview Methods ----------------------
     def downloadData(self):
         if self.state["df"] is None:
             QMessageBox.warning(self, "No Data", "No data available for download.")
             return
     
-        # File selection dialog with Parquet as an option
-        filename, selected_filter = QFileDialog.getSaveFileName(
-            self, "Save Data", "",
-            "CSV Files (*.csv);;Text Files (*.txt);;Excel Files (*.xlsx);;Parquet Files (*.parquet)"
-        )
-    
-        if filename:
-            df = self.state["df"]
-            friendly_df = df.copy()
-            friendly_df.columns = [internal_to_friendly(col, self.master_registry) for col in friendly_df.columns]
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Save Data", "", export_file_filter())
     
-            try:
-                if selected_filter.startswith("CSV"):
-                    friendly_df.to_csv(filename, index=False)
-                elif selected_filter.startswith("Text"):
-                    delimiter, ok = QInputDialog.getText(
-                        self, "Specify Delimiter", "Enter delimiter for text file:", text="\t"
-                    )
-                    if ok:
-                        friendly_df.to_csv(filename, sep=delimiter, index=False)
-                    else:
-                        friendly_df.to_csv(filename, sep="\t", index=False)
-                elif selected_filter.startswith("Excel"):
-                    friendly_df.to_excel(filename, index=False)
-                elif selected_filter.startswith("Parquet"):
-                    friendly_df.to_parquet(filename, index=False, engine="fastparquet")
-    
-                QMessageBox.information(self, "Success", "Data downloaded successfully.")
-            
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to download data: {str(e)}")
+        if not filename:
+            return
+        if self.state["result_is_preview"]:
+            # The preview only holds a sample; export the full result.
+            self.applyAllTransformationsAndRefresh(full=True, on_complete=lambda: self._saveDownload(filename, selected_filter))
+        else:
+            self._saveDownload(filename, selected_filter)
+
+    def _saveDownload(self, filename, selected_filter):
+        df = self.state["df"]
+        filename = export_path_for(filename, selected_filter)
+        delimiter = ","
+        if selected_filter.startswith("Text"):
+            delimiter, ok = QInputDialog.getText(self, "Specify Delimiter", "Enter delimiter for text file:", text="\t")
+            if not ok or not delimiter:
+                delimiter = "\t"
+        # Friendly names are applied while writing, so the result is not copied to relabel it.
+        names = [internal_to_friendly(col, self.master_registry) for col in df.columns]
+        worker = ExportWorker(df, filename, column_names=names, delimiter=delimiter)
+        progress = QProgressDialog(f"Exporting {len(df):,} rows...", "Cancel", 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setAutoClose(False)
+        progress.canceled.connect(worker.cancel)
+        worker.progress.connect(lambda done, total: progress.setValue(int(1000 * done / max(total, 1))))
+
+        def on_exported(path):
+            progress.close()
+            QMessageBox.information(self, "Success", f"Data downloaded successfully to:\n{path}")
+
+        def on_failed(message):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Failed to download data: {message}")
+
+        def on_cancelled():
+            progress.close()
+            self.status_bar.showMessage("Export cancelled.", 5000)
+
+        worker.result_ready.connect(on_exported)
+        worker.failed.connect(on_failed)
+        worker.cancelled.connect(on_cancelled)
+        progress.show()
+        self._startWorker(worker)
 
     def showTransformationSummary(self):
         if not self.state["transformation_summary"]:
@@ -2186,6 +2040,10 @@ class DataTransformerTool(QMainWindow):
         dlg.setWindowTitle("Transformation Summary")
         dlg.setMinimumSize(800, 600)
         layout = QVBoxLayout(dlg)
+        try:
+            from PyQt6.QtWebEngineWidgets import QWebEngineView
+        except ImportError:
+            QWebEngineView = None
         if QWebEngineView is not None:
             view = QWebEngineView()
             view.setHtml(html_string)
@@ -2202,11 +2060,18 @@ class DataTransformerTool(QMainWindow):
         dlg.setLayout(layout)
         dlg.exec()
 
-    def applyAllTransformationsAndRefresh(self):
+    def applyAllTransformationsAndRefresh(self, full=False, on_complete=None):
         if self.state["original_df"] is None:
             self.updatePreview(pd.DataFrame())
             return
-        df = self.state["original_df"].copy()
+        df = self.state["original_df"]
+        is_preview = False
+        # Interactive edits run on a sample; "Run Full" and Download Data run on every row.
+        if self.preview_mode and not full:
+            if self.preview_source is None or self.preview_source[0] is not df:
+                self.preview_source = (df, preview_sample(df))
+            is_preview = len(self.preview_source[1]) < len(df)
+            df = self.preview_source[1]
         if self.pipeline_loaded:
             transformations = {}
             for step in sorted(self.state["pipeline_steps"], key=lambda x: x["order"]):
@@ -2219,91 +2084,94 @@ class DataTransformerTool(QMainWindow):
             "Transformations": transformations,
             "Advanced Excel Functions": self.state["advanced_excel_config"],
         }
-        try:
-            df_transformed, summary_list = apply_transformations_with_summary(df, config)
-            df_transformed = apply_advanced_excel_transformations(df_transformed, config["Advanced Excel Functions"])
-            if "Join Dataframes" in config["Transformations"]:
-                params = config["Transformations"]["Join Dataframes"]
-                join_file = params.get("file_path")
-                if join_file:
-                    try:
-                        ext = os.path.splitext(join_file)[1].lower()
-                        if ext in [".csv", ".txt"]:
-                            second_df = pd.read_csv(join_file)
-                        elif ext in [".xlsx", ".xls"]:
-                            second_df = pd.read_excel(join_file)
-                        else:
-                            second_df = pd.read_csv(join_file)
-                        df_transformed = merge_join_dataframes(
-                            [df_transformed, second_df],
-                            params["join_type"],
-                            params["base_key"],
-                            [params["other_key"]],
-                        )
-                        summary_list.append({
-                            "transformation": "Join Dataframes",
-                            "sequence": 9999,
-                            "initial_count": None,
-                            "new_count": len(df_transformed),
-                        })
-                    except Exception as e:
-                        QMessageBox.critical(self, "Join Error", f"Error joining data:\n{str(e)}")
-            if "Union Dataframes" in config["Transformations"]:
-                params = config["Transformations"]["Union Dataframes"]
-                union_file = params.get("file_path")
-                if union_file:
-                    try:
-                        ext = os.path.splitext(union_file)[1].lower()
-                        if ext in [".csv", ".txt"]:
-                            second_df = pd.read_csv(union_file)
-                        elif ext in [".xlsx", ".xls"]:
-                            second_df = pd.read_excel(union_file)
-                        else:
-                            second_df = pd.read_csv(union_file)
-                        base_cols = list(df_transformed.columns)
-                        second_cols = list(second_df.columns)
-                        if len(base_cols) != len(second_cols):
-                            msg = (
-                                "Union requires dataframes to have the same number of columns.\n"
-                                f"Base has {len(base_cols)} columns, second DF has {len(second_cols)}."
-                            )
-                            QMessageBox.warning(self, "Union Warning", msg)
-                            raise ValueError(msg)
-                        union_all = params.get("union_all", False)
-                        df_transformed = union_dataframes([df_transformed, second_df], union_all)
-                        summary_list.append({
-                            "transformation": "Union Dataframes",
-                            "sequence": 9999,
-                            "initial_count": None,
-                            "new_count": len(df_transformed),
-                        })
-                    except Exception as e:
-                        QMessageBox.critical(self, "Union Error", f"Error unioning data:\n{str(e)}")
-            self.state["df"] = df_transformed
-            self.state["transformation_summary"] = summary_list
-            existing_cols = set(df_transformed.columns)
-            self.column_registry = {cid: self.master_registry[cid] for cid in self.master_registry if cid in existing_cols}
-            display_df = df_transformed.copy()
-            display_df.columns = [internal_to_friendly(col, self.master_registry) for col in display_df.columns]
-            self.updatePreview(display_df)
-            rc = len(df_transformed)
-            self.status_bar.showMessage(f"Row count: {rc}", 5000)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not apply transformations:\n{str(e)}")
+        unknown_steps = validate_transformation_config(transformations)
+        # A newer config supersedes any run still in flight; its result will be discarded.
+        if self.pipeline_worker is not None:
+            self.pipeline_worker.cancel()
+        self.run_generation += 1
+        worker = PipelineWorker(self.run_generation, df, config, self.step_cache)
+        worker.progress.connect(self.onPipelineProgress)
+        worker.result_ready.connect(lambda gen, df_t, summary, errors: self.onPipelineFinished(
+            gen, df_t, summary, errors, unknown_steps, is_preview, on_complete))
+        worker.failed.connect(self.onPipelineFailed)
+        worker.cancelled.connect(self.onPipelineCancelled)
+        self.pipeline_worker = worker
+        self.cancel_run_btn.setEnabled(True)
+        self._startWorker(worker)
+
+    def _startWorker(self, worker):
+        # Keep a reference until the thread ends so it is never destroyed while running.
+        self.active_workers.add(worker)
+        worker.finished.connect(lambda: self.active_workers.discard(worker))
+        worker.start()
+
+    def cancelPipelineRun(self):
+        if self.pipeline_worker is not None:
+            self.pipeline_worker.cancel()
+            self.status_bar.showMessage("Cancelling after the current step...")
+
+    def onPipelineProgress(self, generation, done, total, name):
+        if generation != self.run_generation:
+            return
+        if done < total:
+            self.status_bar.showMessage(f"Running step {done + 1}/{total}: {name}")
 
-    def openSimpleDialog(self, title, fields):
-        dlg = GenericTransformationDialog(list(self.column_registry.values()), self.column_registry,
-                                          param_defs=fields, dialog_title=f"Configure {title}")
-        dlg.setMinimumSize(600, 400)
-        if dlg.exec() == QDialog.DialogCode.Accepted:
-            params = dlg.getValues()
-            if self.pipeline_loaded:
-                self.addPipelineStep(title, params)
-            else:
-                self.state["transformation_params"][title] = params
-            self.applyAllTransformationsAndRefresh()
+    def onPipelineCancelled(self, generation):
+        if generation != self.run_generation:
+            return
+        self.pipeline_worker = None
+        self.cancel_run_btn.setEnabled(False)
+        self.status_bar.showMessage("Run cancelled. Preview shows the previous result.", 5000)
+
+    def onPipelineFailed(self, generation, message):
+        if generation != self.run_generation:
+            return
+        self.pipeline_worker = None
+        self.cancel_run_btn.setEnabled(False)
+        self.status_bar.clearMessage()
+        QMessageBox.critical(self, "Error", f"Could not apply transformations:\n{message}")
+
+    def runFullPipeline(self):
+        self.applyAllTransformationsAndRefresh(full=True)
+
+    def onPreviewModeToggled(self, checked):
+        self.preview_mode = checked
+        self.applyAllTransformationsAndRefresh()
+
+    def onPipelineFinished(self, generation, df_transformed, summary_list, errors, unknown_steps,
+                           is_preview=False, on_complete=None):
+        if generation != self.run_generation:
+            return
+        self.pipeline_worker = None
+        self.cancel_run_btn.setEnabled(False)
+        for title, message in errors:
+            QMessageBox.critical(self, title, message)
+        self.state["df"] = df_transformed
+        self.state["transformation_summary"] = summary_list
+        self.state["result_is_preview"] = is_preview
+        existing_cols = set(df_transformed.columns)
+        self.column_registry = {cid: self.master_registry[cid] for cid in self.master_registry if cid in existing_cols}
+        # Shallow copy: only the column labels change, the model reads the result's own arrays.
+        display_df = df_transformed.copy(deep=False)
+        display_df.columns = [internal_to_friendly(col, self.master_registry) for col in display_df.columns]
+        self.updatePreview(display_df)
+        rc = len(df_transformed)
+        source_rows = len(self.state["original_df"])
+        if is_preview:
+            mode = f"Preview of {len(self.preview_source[1]):,} / {source_rows:,} rows"
+        else:
+            mode = f"Full run ({source_rows:,} rows)"
+        if unknown_steps:
+            self.status_bar.showMessage(f"{mode} | Row count: {rc} | Skipped: {'; '.join(unknown_steps)}")
+        else:
+            self.status_bar.showMessage(f"{mode} | Row count: {rc}")
+        if on_complete is not None:
+            on_complete()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    # Lets QtWebEngine be imported lazily, after the QApplication exists.
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     window = DataTransformerTool()
     window.show()
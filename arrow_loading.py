@@ -0,0 +1,53 @@
+"""
+Memory-mapped loading of Parquet and Arrow IPC/Feather files into ArrowDtype-backed frames.
+
+With PIPELINE_LOAD_MODE=mapped the apps and the batch runner load large inputs this way:
+sources are converted once to an uncompressed Feather file in the conversion cache, which
+is then memory-mapped and wrapped without copying, so every session or worker process
+reading the same file shares the operating system's page cache instead of holding a
+private NumPy copy. Parquet inputs are read through a memory map too, but still have to be
+decoded. The default mode ("copy") keeps the NumPy-backed frames pd.read_parquet returns.
+"""
+import os
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARROW_IPC_EXTENSIONS = (".feather", ".arrow", ".ipc")
+
+def load_mode():
+    return os.environ.get("PIPELINE_LOAD_MODE", "copy").strip().lower()
+
+def mapped_loading_enabled():
+    return load_mode() == "mapped"
+
+def write_feather_uncompressed(df, path):
+    """Writes df as an uncompressed Arrow IPC file, which can be mapped without decoding."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, path, compression="uncompressed")
+
+def read_arrow_table(path, columns=None, memory_map=True):
+    """Reads a Parquet or Arrow IPC/Feather file as a pyarrow Table, memory-mapping the file."""
+    import pyarrow as pa
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ARROW_IPC_EXTENSIONS:
+        source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+        # Uncompressed record batches reference the mapping directly: no copy is made here.
+        table = pa.ipc.open_file(source).read_all()
+        return table.select(columns) if columns is not None else table
+    import pyarrow.parquet as pq
+    return pq.read_table(path, columns=columns, memory_map=memory_map)
+
+def read_mapped(path, columns=None, arrow_dtypes=True):
+    """
+    Loads a Parquet or Arrow IPC/Feather file through a memory map. With arrow_dtypes the
+    columns are ArrowDtype-backed views of the Arrow buffers; otherwise they are converted
+    to NumPy like pd.read_parquet does.
+    """
+    table = read_arrow_table(path, columns=columns)
+    if arrow_dtypes:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
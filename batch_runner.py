@@ -0,0 +1,229 @@
+"""
+Headless batch runner for saved pipeline configs.
+
+    python batch_runner.py pipeline.json "incoming/*.csv" --output-dir out --workers 4
+
+Runs filters, transformations, Advanced Excel Functions and join/union exactly as the GUI
+does, without importing Qt. Every input file gets an output file and a <output>.summary.json;
+a combined batch_summary.json is written to the output directory. "rows_read" counts the
+rows loaded after filters were pushed into the read (Parquet row groups, CSV rows), not
+the rows in the source file.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+import pandas as pd
+from transformations import apply_transformations_with_summary, normalize_json
+from advanced_excel_transformations import apply_advanced_excel_transformations
+from advanced_transformations import apply_join_and_union
+from pipeline_manager import transformations_from_config, column_registry_for, required_source_columns
+from csv_ingest import read_csv_fast
+from excel_ingest import excel_engine
+from dtype_optimizer import apply_dtype_plan
+from exporter import export_frame
+from arrow_loading import ARROW_IPC_EXTENSIONS, mapped_loading_enabled, read_mapped
+from predicate_pushdown import read_csv_filtered, read_parquet_filtered, source_column_names
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "csv.zst": ".csv.zst", "txt": ".txt",
+                  "parquet": ".parquet", "feather": ".feather", "xlsx": ".xlsx"}
+STREAMABLE_EXTENSIONS = {".csv", ".txt", ".parquet"}
+
+def read_input_file(path, header=0, delimiter=",", sheet_name=0):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".csv", ".txt"]:
+        return read_csv_fast(path, header=header, delimiter=delimiter)
+    elif ext in [".xlsx", ".xls"]:
+        return pd.read_excel(path, header=header, sheet_name=sheet_name, engine=excel_engine())
+    elif ext == ".parquet" or ext in ARROW_IPC_EXTENSIONS:
+        if mapped_loading_enabled():
+            return read_mapped(path)
+        return pd.read_parquet(path) if ext == ".parquet" else read_mapped(path, arrow_dtypes=False)
+    elif ext == ".json":
+        return normalize_json(path)
+    elif ext == ".xml":
+        return pd.read_xml(path)
+    return read_csv_fast(path, header=header)
+
+def read_input_filtered(path, filter_conditions, header=0, delimiter=",", positions=None):
+    """
+    Reads an input file, dropping rows the filters cannot keep while reading Parquet and
+    CSV/TXT, and reading only the columns at `positions` (all when None). CSV/TXT go through
+    read_csv_fast either way, so a file has one schema with or without filters. Filters use
+    the positional col_1..col_n ids; the full filters still run after.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet" and (filter_conditions or positions is not None):
+        columns = None
+        if positions is not None:
+            names = source_column_names(path)
+            columns = [names[pos] for pos in positions]
+        return read_parquet_filtered(path, filter_conditions, column_ids=True, columns=columns)
+    if ext in [".csv", ".txt"] and (filter_conditions or positions is not None):
+        return read_csv_filtered(path, filter_conditions, header=header, delimiter=delimiter, column_ids=True,
+                                 usecols=positions)
+    df = read_input_file(path, header=header, delimiter=delimiter)
+    return df if positions is None else df.iloc[:, positions]
+
+def write_output_file(df, path, delimiter=","):
+    export_frame(df, path, delimiter=delimiter)
+
+def run_pipeline_on_file(input_path, output_path, config, delimiter=",", stream=False, chunk_rows=None,
+                         parallel=None, max_barrier_mb=None):
+    """
+    Runs one saved pipeline config on one file and writes the result. Returns the per-file
+    summary dict; failures are reported in it rather than raised. With parallel=N the
+    filters and leading row-local steps of a file loaded in memory run on N row partitions
+    (see parallel_executor). max_barrier_mb caps the data a streamed run may collect for
+    its first in-memory step (default: half the physical memory, see streaming_executor).
+    """
+    started = time.perf_counter()
+    result = {"input": input_path, "output": output_path, "status": "ok"}
+    transformations = transformations_from_config(config)
+    run_config = {
+        "Header Row": config.get("Header Row", 0),
+        "Filters": config.get("Filters", []),
+        "Transformations": transformations,
+        "Advanced Excel Functions": config.get("Advanced Excel Functions", {}),
+    }
+    try:
+        in_ext = os.path.splitext(input_path)[1].lower()
+        out_ext = os.path.splitext(output_path)[1].lower()
+        if stream and in_ext in STREAMABLE_EXTENSIONS and out_ext in STREAMABLE_EXTENSIONS:
+            from streaming_executor import run_streaming_pipeline, DEFAULT_CHUNK_ROWS
+            limit = {} if max_barrier_mb is None else {"max_barrier_bytes": int(max_barrier_mb * 1e6)}
+            summary = run_streaming_pipeline(
+                input_path, output_path, run_config, chunk_rows=chunk_rows or DEFAULT_CHUNK_ROWS,
+                header=run_config["Header Row"], delimiter=delimiter, column_ids=True, **limit)
+            result["rows_read"] = summary[0]["initial_count"] if summary else None
+            result["rows_out"] = summary[-1]["new_count"] if summary else None
+        else:
+            names = source_column_names(input_path, run_config["Header Row"], delimiter)
+            positions = None
+            if names is not None:
+                positions = required_source_columns(config, len(names))
+                result["columns_read"] = f"{len(positions)}/{len(names)}"
+                if len(positions) == len(names):
+                    positions = None
+            df = read_input_filtered(input_path, run_config["Filters"], header=run_config["Header Row"],
+                                     delimiter=delimiter, positions=positions)
+            registry = column_registry_for(df.columns, transformations, positions)
+            df.columns = list(registry)
+            df = apply_dtype_plan(df, config.get("Column Dtypes", {}))
+            result["rows_read"] = len(df)
+            if parallel and parallel > 1:
+                from parallel_executor import apply_transformations_parallel
+                df, summary = apply_transformations_parallel(df, run_config, workers=parallel)
+            else:
+                df, summary = apply_transformations_with_summary(df, run_config)
+            df = apply_advanced_excel_transformations(df, run_config["Advanced Excel Functions"])
+            df, errors = apply_join_and_union(df, transformations, summary)
+            if errors:
+                result["warnings"] = [f"{title}: {message}" for title, message in errors]
+            df.columns = [registry.get(col, col) for col in df.columns]
+            write_output_file(df, output_path, delimiter)
+            result["rows_out"] = len(df)
+        result["steps"] = summary
+    except Exception as e:
+        logger.exception("Pipeline failed for %s", input_path)
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    with open(output_path + ".summary.json", "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=4, default=str)
+    return result
+
+def expand_inputs(patterns):
+    paths, seen = [], set()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            key = os.path.normpath(path)
+            if os.path.isfile(path) and key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+def output_path_for(input_path, output_dir, fmt=None):
+    stem, ext = os.path.splitext(os.path.basename(input_path))
+    out_ext = OUTPUT_FORMATS[fmt] if fmt else (ext.lower() if ext.lower() in OUTPUT_FORMATS.values() else ".csv")
+    return os.path.join(output_dir, f"{stem}_transformed{out_ext}")
+
+def run_batch(pipeline_path, patterns, output_dir, workers=None, fmt=None, delimiter=",", stream=False, chunk_rows=None,
+              parallel=None, max_barrier_mb=None):
+    """
+    Runs a saved pipeline over every file matching the patterns. Returns the list of per-file
+    summaries. With parallel set, files run one at a time unless workers is given explicitly,
+    so the partition pools do not compete with a pool of files.
+    """
+    with open(pipeline_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    inputs = expand_inputs(patterns)
+    if not inputs:
+        logger.warning("No input files match %s", patterns)
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(path, output_path_for(path, output_dir, fmt)) for path in inputs]
+    if parallel and workers is None:
+        workers = 1
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    results = []
+    if workers == 1:
+        for path, out in jobs:
+            results.append(run_pipeline_on_file(path, out, config, delimiter, stream, chunk_rows, parallel,
+                                                max_barrier_mb))
+            logger.info("%s -> %s [%s]", path, out, results[-1]["status"])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            futures = {pool.submit(run_pipeline_on_file, path, out, config, delimiter, stream, chunk_rows, parallel,
+                                   max_barrier_mb): path
+                       for path, out in jobs}
+            for future in as_completed(futures):
+                results.append(future.result())
+                logger.info("%s -> %s [%s]", futures[future], results[-1]["output"], results[-1]["status"])
+        order = {path: i for i, (path, _) in enumerate(jobs)}
+        results.sort(key=lambda r: order[r["input"]])
+    with open(os.path.join(output_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"pipeline": pipeline_path, "files": results}, f, indent=4, default=str)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a saved pipeline config over a batch of files without the GUI.")
+    parser.add_argument("pipeline", help="Pipeline JSON saved from the app (Save Pipeline).")
+    parser.add_argument("inputs", nargs="+", help="Input files or glob patterns (quote them to avoid shell expansion).")
+    parser.add_argument("-o", "--output-dir", default="output", help="Directory for outputs and summaries.")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Files processed concurrently (default: CPU count).")
+    parser.add_argument("-f", "--format", choices=sorted(OUTPUT_FORMATS), default=None,
+                        help="Output format (default: same as input, CSV for other inputs).")
+    parser.add_argument("-d", "--delimiter", default=",", help="Delimiter for CSV/TXT input and output.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process CSV/TXT/Parquet files in chunks instead of loading them whole.")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="Rows per chunk with --stream.")
+    parser.add_argument("--max-barrier-mb", type=float, default=None,
+                        help="With --stream, fail a file once the rows reaching its first sort/group/dedup step "
+                             "pass this many MB (default: half the physical memory).")
+    parser.add_argument("--parallel", type=int, default=None, metavar="N",
+                        help="Run the row-local steps of each file on N row partitions in a process pool.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every pipeline step.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(levelname)s: %(message)s")
+    logger.setLevel(logging.INFO)
+    results = run_batch(args.pipeline, args.inputs, args.output_dir, args.workers, args.format,
+                        args.delimiter, args.stream, args.chunk_rows, args.parallel, args.max_barrier_mb)
+    failed = [r for r in results if r["status"] != "ok"]
+    for r in results:
+        detail = f"{r.get('rows_read')} read -> {r.get('rows_out')} rows" if r["status"] == "ok" else r.get("error")
+        print(f"[{r['status']}] {r['input']}: {detail} ({r['seconds']}s)")
+    if not results:
+        return 2
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Import-time benchmark for the transformation engine.
+
+    python benchmarks/import_time.py [--repeat 5]
+
+Imports each engine module in a fresh interpreter, reports the median wall time next to
+a bare `import pandas` baseline, and fails (exit code 1) if any GUI, lineage or SQL stack
+is loaded as a side effect. Batch jobs and worker processes pay this cost on every start.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENGINE_MODULES = [
+    "transformations",
+    "advanced_excel_transformations",
+    "advanced_transformations",
+    "pipeline_planner",
+    "step_cache",
+    "pipeline_manager",
+    "streaming_executor",
+    "parallel_executor",
+    "batch_runner",
+    "predicate_pushdown",
+    "parquet_cache",
+    "csv_ingest",
+    "arrow_loading",
+    "dtype_optimizer",
+    "exporter",
+    "excel_ingest",
+    "raw_tables",
+    "window_functions",
+]
+
+# Stacks the engine must only load when the feature that needs them is used.
+FORBIDDEN_PREFIXES = ("PyQt5", "PyQt6", "pyvis", "jinja2", "pandasql", "lineage", "ui_helpers")
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+def measure(module, repeat):
+    """Median import time of `module` over `repeat` fresh interpreters, plus the modules it loaded."""
+    timings, loaded = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        loaded = result["modules"]
+    return statistics.median(timings), loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module.")
+    args = parser.parse_args(argv)
+    baseline, _ = measure("pandas", args.repeat)
+    print(f"{'module':<34}{'import (s)':>12}{'over pandas (s)':>18}")
+    print(f"{'pandas (baseline)':<34}{baseline:>12.3f}{'':>18}")
+    failures = []
+    for module in ENGINE_MODULES:
+        seconds, loaded = measure(module, args.repeat)
+        leaked = sorted({name.split(".")[0] for name in loaded if name.startswith(FORBIDDEN_PREFIXES)})
+        print(f"{module:<34}{seconds:>12.3f}{seconds - baseline:>18.3f}" + (f"  loads {', '.join(leaked)}" if leaked else ""))
+        if leaked:
+            failures.append(module)
+    if failures:
+        print(f"GUI/lineage/SQL modules imported by: {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""
+Conformance and speed suite for the registered transformation steps.
+
+    python benchmarks/transform_conformance.py [--sizes 1000,100000,10000000] [--repeat 3]
+        [--save-baseline FILE] [--baseline FILE] [--time-tolerance 0.25] [--memory-tolerance 0.10]
+
+Runs every step in transformations.TRANSFORMATION_REGISTRY through apply_transformation_step,
+the dispatcher the pipeline uses, on synthetic frames of each size. For each step and size it
+reports the function that actually ran (module, name and line), the best wall time of
+--repeat runs, the peak memory traced while the step ran, and a fingerprint of the result.
+
+The suite fails (exit code 1) when:
+  - an engine or app module defines the same function or class twice in one scope, so the
+    later definition silently replaces the earlier one,
+  - a registered step has no case in CASES,
+  - a step raises or logs an error (or, with --baseline, starts doing so),
+  - with --baseline: a result fingerprint changes, or time or peak memory grows beyond the
+    tolerance.
+
+--save-baseline writes the run as JSON for a later --baseline comparison. Time baselines are
+machine specific, so save and compare them on the same machine. Steps that call Python once
+per row (ROW_WISE_STEPS) only run up to ROW_WISE_LIMIT rows.
+
+tests/test_transform_conformance.py runs the correctness checks at 1e3 rows under pytest.
+"""
+import os
+import re
+import sys
+import ast
+import json
+import time
+import logging
+import argparse
+import hashlib
+import tracemalloc
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import transformations  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+ROW_WISE_LIMIT = 100_000
+
+# Absolute slack under which time and memory changes are treated as noise.
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA = 1 << 20
+
+WORDS = ["alpha", "Beta", "gamma ray", "DELTA", "epsilon  x", "zeta-9"]
+CODES = [f"C{i:03d}" for i in range(250)]
+LOOKUP_TABLE = [{"code": code, "label": f"Label {code}"} for code in CODES[:200]]
+
+def _custom_function(df):
+    df["amount_per_unit"] = df["amount"] / df["quantity"]
+    return df
+
+# One config per registered step, over the columns of synthetic_frame.
+CASES = {
+    "Unique": {"column": "category"},
+    "Sort Array": {"column": "amount", "ascending": False},
+    "NPV": {"cashflow_column": "cashflows", "discount_rate": 0.08},
+    "IRR": {"cashflow_column": "cashflows"},
+    "PMT": {"rate": 0.05 / 12, "nper": 360, "pv": 250000},
+    "DATEDIF": {"start_date_column": "start_date", "end_date_column": "end_date", "unit": "days"},
+    "EOMONTH": {"date_column": "start_date", "months": 1},
+    "WEEKDAY": {"date_column": "start_date"},
+    "Median": {"column": "amount"},
+    "Std": {"column": "amount"},
+    "Percentile": {"column": "amount", "percentile": 90},
+    "Mode": {"column": "category"},
+    "Abs": {"column": "amount"},
+    "Power": {"column": "amount", "exponent": 2},
+    "Sqrt": {"column": "quantity"},
+    "LEFT": {"column": "text", "num_chars": 3},
+    "RIGHT": {"column": "text", "num_chars": 3},
+    "MID": {"column": "text", "start": 2, "num_chars": 4},
+    "LEN": {"column": "text"},
+    "TEXTJOIN": {"columns": ["category", "code"], "delimiter": "-"},
+    "IF": {"column": "amount", "condition": "df['amount'] > 100", "true_value": "high", "false_value": "low"},
+    "IFERROR": {"column": "amount", "fallback": 0},
+    "XLOOKUP": {"source_column": "code", "lookup_table": LOOKUP_TABLE, "lookup_key": "code",
+                "lookup_value": "label"},
+    "INDEX/MATCH": {"source_column": "code", "lookup_table": LOOKUP_TABLE, "lookup_key": "code",
+                    "return_column": "label"},
+    "Pivot Data": {"index": ["group"], "columns": ["category"],
+                   "value_settings": [{"value_column": "amount", "aggfunc": "sum"},
+                                      {"value_column": "quantity", "aggfunc": "mean"}],
+                   "missing_fill": 0},
+    "Unpivot Data": {"id_vars": ["id"], "value_vars": ["amount", "quantity"]},
+    "Drop Columns": {"columns_to_drop": ["text"], "registry": {"text": "text"}},
+    "Drop Unnamed Columns": {},
+    "Remove Duplicates": {"columns_to_dedup": ["group", "category"], "keep": "first"},
+    "Detect Outliers": {"column": "amount", "method": "zscore", "threshold": 3.0},
+    "Flag Missing Values": {"columns": ["amount"], "new_flag": "amount_missing"},
+    "Generate Unique IDs": {"new_column": "row_key", "method": "hashkey", "columns": ["id", "code"]},
+    "Lag Column": {"column": "amount", "periods": 1, "new_column": "amount_lag"},
+    "Rank Values": {"column": "amount", "method": "min", "new_column": "amount_rank"},
+    "Split Column": {"split_column": "category", "split_char": " ", "maxsplit": 1},
+    "Concatenate Columns": {"columns": ["category", "code"], "delimiter": "-", "new_column": "category_code"},
+    "Transpose Data": {},
+    "Group & Aggregate": {"group_columns": ["category"],
+                          "aggregations": {"amount": ["sum", "mean", "p90"], "code": "count_distinct"}},
+    "Sort Data": {"columns": ["category", "amount"], "ascending": [True, False]},
+    "Trim": {"columns": {"text": {"operations": ["Trim Spaces", "Remove Extra Spaces"]}}},
+    "Change Case": {"columns": {"category": "uppercase"}},
+    "Replace Substring": {"columns": {"text": {"old_sub": "[n]", "new_sub": "(n)", "global": False}}},
+    "Fill Missing Values": {"column": "amount", "method": "Median"},
+    "Convert Datatype": {"columns": {"quantity": {"new_type": "float"}}},
+    "Standardize Date Format": {"column": "date_text", "date_format": "%Y-%m-%d", "input_formats": ["%d/%m/%Y"]},
+    "Normalize Data": {"column": "amount", "norm_method": "zscore"},
+    "Extract Substrings": {"column": "text", "start": 2, "num_chars": 5},
+    "Extract Text Between": {"column": "text", "left_delim": "[", "right_delim": "]"},
+    "Extract Numeric Values": {"column": "text"},
+    "Round Numbers": {"column": "amount", "decimals": 1, "new_column": "amount_round"},
+    "Percentage Change": {"column": "amount", "new_column": "amount_pct"},
+    "Bucketize Values": {"column": "amount", "bins": [0, 50, 100, 150, 1000], "labels": ["low", "mid", "high", "top"]},
+    "Extract Date Components": {"column": "start_date"},
+    "Date Shift": {"column": "start_date", "shift_value": 7, "unit": "d", "new_column": "start_date_shifted"},
+    "Next Working Day": {"column": "start_date", "new_column": "start_date_next_working_day"},
+    "Find and Replace": {"column": "category", "find": "a", "replace": "A"},
+    "Running Total": {"column": "amount", "new_column": "amount_cumsum", "group_by": "group"},
+    "Moving Average": {"column": "amount", "window": 7, "new_column": "amount_ma7"},
+    "Conditional Column Creation": {"condition": "amount > quantity * 3", "true_value": "yes",
+                                    "false_value": "no", "new_column": "amount_vs_quantity"},
+    "Custom Function": {"function": _custom_function},
+    "Analytical Functions": {"group_columns": ["group"],
+                             "analytical": {"amount": {"cumsum": {"order_by": "start_date"},
+                                                       "rolling_mean": {"window": 3, "order_by": "start_date"}},
+                                            "quantity": {"rank": {"method": "min"}}}},
+    "Window Functions": {"partition_by": ["category"], "order_by": ["start_date"],
+                         "functions": [{"function": "row_number"},
+                                       {"function": "lag", "column": "amount"},
+                                       {"function": "sum", "column": "amount", "frame": "rows",
+                                        "preceding": 6, "following": 0}]},
+}
+
+# Steps that call Python once per row or need the per-row cashflow lists.
+ROW_WISE_STEPS = {"NPV", "IRR", "EOMONTH", "TEXTJOIN", "Generate Unique IDs", "Concatenate Columns", "Transpose Data",
+                  "Next Working Day"}
+
+def synthetic_frame(n, seed=0):
+    """A mixed-type frame of n rows: ids, group keys, strings, floats with gaps, ints and dates."""
+    rng = np.random.default_rng(seed)
+    amount = rng.normal(100, 25, n).round(2)
+    amount[rng.random(n) < 0.05] = np.nan
+    day = rng.integers(0, 1500, n)
+    days = pd.date_range("2020-01-01", periods=1500, freq="D")
+    # Dates are formatted once per distinct day, not once per row.
+    day_text = np.asarray(days.strftime("%d/%m/%Y"), dtype=object)
+    frame = pd.DataFrame({
+        "id": np.arange(n),
+        "group": rng.integers(0, max(n // 100, 1), n),
+        "category": np.asarray(WORDS, dtype=object)[rng.integers(0, len(WORDS), n)],
+        "code": np.asarray(CODES, dtype=object)[rng.integers(0, len(CODES), n)],
+        "amount": amount,
+        "quantity": rng.integers(1, 50, n),
+        "start_date": days[day],
+        "end_date": days[day] + pd.to_timedelta(rng.integers(0, 400, n), unit="D"),
+        "date_text": day_text[day],
+    })
+    frame["text"] = "  " + frame["category"] + " " + frame["quantity"].astype(str) + " [n]  "
+    if n <= ROW_WISE_LIMIT:
+        frame["cashflows"] = [[-100.0, 30.0, 40.0, 50.0 + i % 7] for i in range(n)]
+    return frame
+
+def duplicate_definitions(paths):
+    """(path, scope, name, line numbers) for every function or class defined twice in one scope."""
+    found = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        pending = [("<module>", tree.body)]
+        while pending:
+            scope, body = pending.pop()
+            seen = defaultdict(list)
+            for node in body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    seen[node.name].append(node.lineno)
+                if isinstance(node, ast.ClassDef):
+                    pending.append((node.name, node.body))
+            found.extend((os.path.relpath(path, REPO_ROOT), scope, name, lines)
+                         for name, lines in seen.items() if len(lines) > 1)
+    return found
+
+def _cell_digests(column):
+    """8-byte digest of each cell's text, computed once per distinct object (Unique/Sort Array share one list)."""
+    seen = {}
+    out = []
+    for value in column:
+        digest = seen.get(id(value))
+        if digest is None:
+            digest = seen[id(value)] = hashlib.sha256(repr(value).encode()).digest()[:8]
+        out.append(digest)
+    return b"".join(out)
+
+def fingerprint(result):
+    """Content hash of a result frame: column names, dtypes and every value, including the index."""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in result.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(result.index).to_numpy().tobytes())
+    for col in range(result.shape[1]):
+        column = result.iloc[:, col]
+        try:
+            digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable cells (lists, dicts) are hashed by their text.
+            digest.update(_cell_digests(column))
+    return digest.hexdigest()[:16]
+
+class _ProblemCollector(logging.Handler):
+    """Keeps the error records a step logs; steps report failures by logging rather than raising."""
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        # Some steps put a whole column into their message.
+        self.messages.append(record.getMessage()[:300])
+
+def run_step(name, frame, repeat):
+    """Best time, peak traced memory, fingerprint and problems of one step on copies of frame."""
+    info = CASES[name]
+    collector = _ProblemCollector()
+    root = logging.getLogger()
+    level = root.level
+    # A root level above ERROR would drop the records before they reach the collector.
+    root.setLevel(min(level, logging.ERROR) if level else logging.ERROR)
+    root.addHandler(collector)
+    try:
+        timings = []
+        result = None
+        for _ in range(repeat):
+            df = frame.copy()
+            start = time.perf_counter()
+            try:
+                result = transformations.apply_transformation_step(df, name, dict(info), {name: info})
+            except Exception as e:
+                collector.messages.append(f"raised {type(e).__name__}: {e}")
+                return {"status": "error", "problems": collector.messages[:3]}
+            timings.append(time.perf_counter() - start)
+        df = frame.copy()
+        tracemalloc.start()
+        try:
+            transformations.apply_transformation_step(df, name, dict(info), {name: info})
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        root.removeHandler(collector)
+        root.setLevel(level)
+    return {
+        "status": "error" if collector.messages else "ok",
+        "problems": sorted(set(collector.messages))[:3],
+        "seconds": min(timings),
+        "peak_bytes": peak,
+        "rows_out": len(result),
+        "fingerprint": fingerprint(result),
+    }
+
+def _size_label(n):
+    return f"{n:.0e}".replace("e+0", "e") if n >= 1000 else str(n)
+
+def compare(name, size, run, base, time_tolerance, memory_tolerance):
+    """Regression messages for one step and size against its baseline entry."""
+    if base is None:
+        return []
+    label = f"{name} @ {_size_label(size)}"
+    if run["status"] != base["status"]:
+        return [f"{label}: status {base['status']} -> {run['status']} ({'; '.join(run['problems'])})"]
+    if run["status"] != "ok":
+        return []
+    problems = []
+    if run["fingerprint"] != base["fingerprint"]:
+        problems.append(f"{label}: result changed (fingerprint {base['fingerprint']} -> {run['fingerprint']})")
+    slower = run["seconds"] - base["seconds"]
+    if slower > MIN_TIME_DELTA and run["seconds"] > base["seconds"] * (1 + time_tolerance):
+        problems.append(f"{label}: {base['seconds']:.4f}s -> {run['seconds']:.4f}s")
+    grown = run["peak_bytes"] - base["peak_bytes"]
+    if grown > MIN_MEMORY_DELTA and run["peak_bytes"] > base["peak_bytes"] * (1 + memory_tolerance):
+        problems.append(f"{label}: peak {base['peak_bytes'] / 2**20:.1f} MiB -> {run['peak_bytes'] / 2**20:.1f} MiB")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma-separated frame sizes in rows.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per step and size (best is kept).")
+    parser.add_argument("--steps", default="", help="Regular expression selecting the steps to run.")
+    parser.add_argument("--baseline", help="JSON from an earlier --save-baseline run to compare against.")
+    parser.add_argument("--save-baseline", help="Write this run's results as JSON.")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed relative slowdown.")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="Allowed relative peak memory growth.")
+    args = parser.parse_args(argv)
+    sizes = [int(float(size)) for size in args.sizes.split(",") if size.strip()]
+    # Only errors, and run_step collects those while a step runs.
+    logging.getLogger().setLevel(logging.ERROR)
+
+    failures = []
+    sources = [os.path.join(REPO_ROOT, name) for name in sorted(os.listdir(REPO_ROOT)) if name.endswith(".py")]
+    for path, scope, name, lines in duplicate_definitions(sources):
+        failures.append(f"{path}: {scope}.{name} defined {len(lines)} times (lines {', '.join(map(str, lines))})")
+
+    # Aliases registered for one function run once, under their first name.
+    steps = {}
+    for name, func in transformations.TRANSFORMATION_REGISTRY.items():
+        steps.setdefault(func, []).append(name)
+    selected = [names for names in steps.values() if not args.steps or any(re.search(args.steps, n) for n in names)]
+    for names in selected:
+        if names[0] not in CASES:
+            failures.append(f"{' / '.join(names)}: no conformance case")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    print(f"{'step':<30}{'rows':>7}{'time (s)':>11}{'peak MiB':>10}{'rows out':>11}  {'result':<17} implementation")
+    for size in sizes:
+        frame = synthetic_frame(size)
+        for names in selected:
+            name = names[0]
+            if name not in CASES:
+                continue
+            func = transformations.TRANSFORMATION_REGISTRY[name]
+            where = f"{func.__module__}.{func.__name__}:{func.__code__.co_firstlineno}"
+            if name in ROW_WISE_STEPS and size > ROW_WISE_LIMIT:
+                print(f"{name:<30}{_size_label(size):>7}{'row-wise, skipped':>32}  {'':<17} {where}")
+                continue
+            run = run_step(name, frame, args.repeat)
+            run["implementation"] = where
+            results.setdefault(name, {})[str(size)] = run
+            if run["status"] == "ok":
+                print(f"{name:<30}{_size_label(size):>7}{run['seconds']:>11.4f}{run['peak_bytes'] / 2**20:>10.1f}"
+                      f"{run['rows_out']:>11}  {run['fingerprint']:<17} {where}")
+            else:
+                print(f"{name:<30}{_size_label(size):>7}{'ERROR':>11}{'':>21}  {'; '.join(run['problems'])[:60]}")
+            base = baseline.get(name, {}).get(str(size))
+            if args.baseline:
+                failures.extend(compare(name, size, run, base, args.time_tolerance, args.memory_tolerance))
+            elif run["status"] != "ok":
+                failures.append(f"{name} @ {_size_label(size)}: {'; '.join(run['problems'])}")
+        del frame
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"pandas": pd.__version__, "numpy": np.__version__, "sizes": sizes, "results": results},
+                      f, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+    if failures:
+        print(f"\n{len(failures)} conformance failure(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Multi-threaded CSV/TXT ingestion on pyarrow.csv.
+
+read_csv_fast parses blocks of the file on several threads and returns the same frame as
+pd.read_csv(path, header=header, delimiter=delimiter, usecols=usecols): date and time text
+stays text, the pandas NA tokens are recognized, all-null columns come back as float. With
+arrow_dtypes=True the columns are ArrowDtype-backed instead of NumPy. Dialects Arrow does not
+handle the same way (multi-character or regex delimiters, no header row, unnamed or
+duplicate columns, an index column, values that do not match the types inferred from the
+first block) fall back to pd.read_csv. So do files where Arrow parses numbers pandas does
+not: any "0x"/"0X" in the file (Arrow reads hex integers, pandas keeps them as text), whole
+numbers outside the int64 range (Arrow gives float64, pandas uint64 or text), NaN spellings
+missing from pandas' NA list such as "NAN" (Arrow reads NaN, pandas keeps the text) and
+columns of integers written with a leading "+" (Arrow gives float64, pandas int64).
+
+The source is a path or the file's contents as bytes (raw_tables keeps those in memory so a
+new header row does not re-read the file).
+"""
+import io
+import mmap
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_BYTES = 16 * 1024 * 1024
+
+# The strings pd.read_csv treats as missing by default.
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+INT64_BOUND = float(2 ** 63)
+
+class _UnsupportedDialect(Exception):
+    pass
+
+def _contains(data, marker):
+    # memchr for the rare letter first; "0" is everywhere in numeric files, so a plain
+    # two-byte find is only used when the letter itself turns up often.
+    pos = data.find(marker[1:], 1)
+    for _ in range(64):
+        if pos == -1:
+            return False
+        if data[pos - 1] == marker[0]:
+            return True
+        pos = data.find(marker[1:], pos + 1)
+    return data.find(marker) != -1
+
+def _describe(source):
+    return source if isinstance(source, str) else f"<{len(source)} bytes in memory>"
+
+def _input(source):
+    """What pyarrow.csv reads: the path itself, or a fresh reader over in-memory bytes."""
+    if isinstance(source, bytes):
+        import pyarrow as pa
+        return pa.BufferReader(source)
+    return source
+
+def _scan_bytes(path, predicate):
+    if isinstance(path, bytes):
+        return predicate(path)
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return predicate(data)
+        except ValueError:
+            # Empty file.
+            return False
+
+def _may_contain_hex(path):
+    """True when the raw file holds "0x"/"0X"; a byte scan, far cheaper than re-checking parsed columns."""
+    return _scan_bytes(path, lambda data: _contains(data, b"0x") or _contains(data, b"0X"))
+
+def _may_contain_plus(path):
+    return _scan_bytes(path, lambda data: data.find(b"+") != -1)
+
+def _signed_int_columns(path, read_options, parse_options, names):
+    """Names of the given columns whose every value is an integer literal, read back as text."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.compute as pc
+    convert_options = pacsv.ConvertOptions(column_types={name: pa.string() for name in names},
+                                           include_columns=names)
+    table = pacsv.read_csv(_input(path), read_options=read_options, parse_options=parse_options,
+                           convert_options=convert_options)
+    return [name for name in names
+            if pc.all(pc.match_substring_regex(table.column(name), r"^\s*[+-]?\d+\s*$")).as_py()]
+
+def _arrow_read(path, header, delimiter, usecols, arrow_dtypes, use_threads, block_size, row_mask=None):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    if not isinstance(header, int) or isinstance(header, bool) or header < 0:
+        raise _UnsupportedDialect(f"header={header!r}")
+    if not isinstance(delimiter, str) or len(delimiter) != 1:
+        raise _UnsupportedDialect(f"delimiter={delimiter!r}")
+    if _may_contain_hex(path):
+        raise _UnsupportedDialect("hex-like values")
+    read_options = pacsv.ReadOptions(skip_rows=header, use_threads=use_threads, block_size=block_size)
+    parse_options = pacsv.ParseOptions(delimiter=delimiter)
+    convert_options = pacsv.ConvertOptions(null_values=PANDAS_NA_VALUES, strings_can_be_null=True)
+    # The streaming reader only parses the first block: enough for the names and inferred types.
+    with pacsv.open_csv(_input(path), read_options=read_options, parse_options=parse_options,
+                        convert_options=convert_options) as reader:
+        schema = reader.schema
+    names = schema.names
+    if any(not name for name in names) or len(set(names)) != len(names):
+        raise _UnsupportedDialect("unnamed or duplicate columns")
+    # pandas leaves dates and times as text unless asked to parse them.
+    column_types = {field.name: pa.string() for field in schema if pa.types.is_temporal(field.type)}
+    include = [names[pos] for pos in sorted(usecols)] if usecols is not None else []
+    convert_options = pacsv.ConvertOptions(null_values=PANDAS_NA_VALUES, strings_can_be_null=True,
+                                           column_types=column_types, include_columns=include)
+    table = pacsv.read_csv(_input(path), read_options=read_options, parse_options=parse_options,
+                           convert_options=convert_options)
+    import pyarrow.compute as pc
+    whole = []
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+        elif pa.types.is_floating(field.type):
+            column = table.column(i)
+            # pandas' own NaN spellings are in null_values, so a NaN here was some other spelling.
+            if pc.any(pc.is_nan(column)).as_py():
+                raise _UnsupportedDialect(f"NaN spelling pandas keeps as text in '{field.name}'")
+            bounds = pc.min_max(column)
+            low, high = bounds["min"].as_py(), bounds["max"].as_py()
+            # -2**63 - 1 rounds to exactly -2**63 as a float, hence <=.
+            if high is not None and (high >= INT64_BOUND or low <= -INT64_BOUND):
+                raise _UnsupportedDialect(f"values beyond int64 in '{field.name}'")
+            if high is not None and column.null_count == 0 and pc.all(pc.equal(column, pc.floor(column))).as_py():
+                whole.append(field.name)
+    # Arrow's integer parser rejects "+5" and falls back to double; pandas reads it as int64.
+    if whole and _may_contain_plus(path):
+        signed = _signed_int_columns(path, read_options, parse_options, whole)
+        if signed:
+            raise _UnsupportedDialect(f"'+'-signed integers in {signed}")
+    labels = None
+    keep = row_mask(table) if row_mask is not None else None
+    if keep is not None:
+        labels = pc.indices_nonzero(pc.fill_null(keep, False))
+        table = table.take(labels)
+    if arrow_dtypes:
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    else:
+        df = table.to_pandas()
+        for field, column in zip(table.schema, table.columns):
+            if pa.types.is_string(field.type) and column.null_count:
+                # Missing text is NaN in pandas, None from Arrow.
+                df[field.name] = df[field.name].where(df[field.name].notna(), np.nan)
+    if labels is not None:
+        df.index = labels.to_numpy().astype(np.int64)
+    return df
+
+def read_csv_fast(path, header=0, delimiter=",", usecols=None, arrow_dtypes=False, use_threads=True,
+                  block_size=DEFAULT_BLOCK_BYTES, row_mask=None):
+    """
+    Reads a CSV/TXT file (a path, or its contents as bytes) with pyarrow.csv, falling back to
+    pd.read_csv (see module docstring). row_mask, when given, is called with the parsed Arrow
+    table and returns a boolean array of the rows to keep (or None to keep them all); only
+    those rows are converted, labelled with their row numbers as in full.loc[mask]. The
+    pandas fallback returns every row, so callers still apply their exact filter.
+    """
+    try:
+        return _arrow_read(path, header, delimiter, usecols, arrow_dtypes, use_threads, block_size, row_mask)
+    except ImportError:
+        pass
+    except _UnsupportedDialect as e:
+        logger.info("Reading %s with pandas: %s", _describe(path), e)
+    except Exception as e:
+        logger.info("Arrow CSV reader could not read %s, using pandas: %s", _describe(path), e)
+    source = io.BytesIO(path) if isinstance(path, bytes) else path
+    df = pd.read_csv(source, header=header, delimiter=delimiter, usecols=usecols)
+    if arrow_dtypes:
+        df = df.convert_dtypes(dtype_backend="pyarrow")
+    return df
@@ -16,8 +16,7 @@ import pandas as pd
 from pandas import NamedAgg
 import numpy as np
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+# Logging is configured by the entry point (GUI or batch runner), not on import.
 logger = logging.getLogger(__name__)
 
 # -------------------- Split Column --------------------
@@ -0,0 +1,135 @@
+"""
+Optional dtype optimization pass for freshly loaded frames.
+
+optimize_dtypes stores low-cardinality text columns as category and other text columns held
+as Python objects as string[pyarrow]. Text is recognised by pd.api.types.is_string_dtype, so
+both object columns and the str/StringDtype columns pandas 3 loads by default qualify. On
+request it also downcasts integer columns to the smallest width (not below int32) that holds
+their values and float64 columns to float32 when that loses nothing. It returns the chosen
+dtypes as a plan that is saved in the pipeline JSON ("Column Dtypes"); apply_dtype_plan
+applies a saved plan on later runs without inspecting the data again, keeping any column
+whose new values no longer fit.
+
+Numeric downcasting is off by default: fitting the loaded values says nothing about what
+later steps compute from them. Power or Running Total on an int32 column wraps around
+silently, and sums and means over float32 lose precision. A category column rejects values
+that are not already categories, so list the columns that steps write new values into
+(Fill Missing Values, Find and Replace, ...) in exclude, or pass text_dtype="string[pyarrow]".
+"""
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY_RATIO = 0.5
+# Floor for downcast_ints=True. It only bounds the damage: int32 arithmetic still wraps.
+MIN_INT_DTYPE = np.int32
+TEXT_DTYPES = ("string[pyarrow]", "category")
+
+def memory_usage_bytes(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+def _smallest_int_dtype(s):
+    lo, hi = s.min(), s.max()
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        if np.iinfo(dtype).bits < np.iinfo(MIN_INT_DTYPE).bits:
+            continue
+        if np.iinfo(dtype).min <= lo and hi <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return s.dtype
+
+def _is_text(s):
+    # is_string_dtype also accepts categoricals; for object columns it inspects the values.
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return False
+    return pd.api.types.is_string_dtype(s)
+
+def _is_arrow_string(dtype):
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow"
+
+def _choose_dtype(s, category_ratio, text_dtype, downcast_ints, downcast_floats):
+    if len(s) == 0:
+        return None
+    if downcast_ints and pd.api.types.is_integer_dtype(s.dtype) and s.dtype.kind == "i":
+        dtype = _smallest_int_dtype(s)
+        return str(dtype) if dtype != s.dtype else None
+    if downcast_floats and s.dtype == np.float64:
+        narrowed = s.to_numpy().astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), s.to_numpy(), equal_nan=True):
+            return "float32"
+        return None
+    if not _is_text(s):
+        return None
+    dtype = text_dtype if s.nunique(dropna=True) <= category_ratio * len(s) else "string[pyarrow]"
+    # Arrow-backed str (the pandas 3 default) is already as compact as string[pyarrow].
+    if dtype == "string[pyarrow]" and _is_arrow_string(s.dtype):
+        return None
+    return dtype
+
+def optimize_dtypes(df, category_ratio=DEFAULT_CATEGORY_RATIO, text_dtype="category",
+                    downcast_ints=False, downcast_floats=False, exclude=()):
+    """
+    Returns (optimized_df, plan, (bytes_before, bytes_after)). plan maps each changed column
+    to its new dtype string. Text columns with at most category_ratio * rows distinct values
+    become text_dtype ("category" or "string[pyarrow]"); other text columns stored as Python
+    objects become string[pyarrow]. Only ask for downcast_ints or
+    downcast_floats when no arithmetic or aggregate step reads the columns involved, or
+    list those columns in exclude.
+    """
+    if text_dtype not in TEXT_DTYPES:
+        raise ValueError(f"text_dtype must be one of {TEXT_DTYPES}, not {text_dtype!r}")
+    before = memory_usage_bytes(df)
+    plan = {}
+    for col in df.columns:
+        if col in exclude:
+            continue
+        dtype = _choose_dtype(df[col], category_ratio, text_dtype, downcast_ints, downcast_floats)
+        if dtype is not None:
+            plan[str(col)] = dtype
+    df = apply_dtype_plan(df, plan)
+    after = memory_usage_bytes(df)
+    logger.info("Dtype optimization: %d columns changed, %.1f MB -> %.1f MB",
+                len(plan), before / 1e6, after / 1e6)
+    return df, plan, (before, after)
+
+def _fits(s, dtype):
+    """True when converting s to dtype keeps every value."""
+    if dtype.kind == "i":
+        if not pd.api.types.is_integer_dtype(s.dtype) or s.dtype.kind != "i":
+            return False
+        return len(s) == 0 or (np.iinfo(dtype).min <= s.min() and s.max() <= np.iinfo(dtype).max)
+    if dtype == np.float32:
+        if s.dtype != np.float64:
+            return False
+        values = s.to_numpy()
+        return np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+    return True
+
+def apply_dtype_plan(df, plan):
+    """
+    Converts the columns named in plan (column -> dtype string) without re-running the
+    inference. Columns that are missing, or whose values would not survive the conversion,
+    are left as they are.
+    """
+    if not plan:
+        return df
+    converted = {}
+    for col, dtype_name in plan.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        try:
+            dtype = pd.api.types.pandas_dtype(dtype_name)
+            if isinstance(dtype, np.dtype) and not _fits(s, dtype):
+                logger.info("Keeping %s as %s: values do not fit %s", col, s.dtype, dtype_name)
+                continue
+            converted[col] = s.astype(dtype)
+        except (TypeError, ValueError, ImportError) as e:
+            logger.warning("Could not convert %s to %s: %s", col, dtype_name, e)
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for col, s in converted.items():
+        df[col] = s
+    return df
@@ -0,0 +1,37 @@
+"""
+Excel ingestion with a faster read engine.
+
+Worksheets are read with pandas' "calamine" engine when python-calamine is installed
+(a Rust reader several times faster than openpyxl) and otherwise with pandas' default
+engine, which streams .xlsx files through openpyxl in read-only mode. PIPELINE_EXCEL_ENGINE
+forces a specific engine. parse_raw_sheet returns a sheet's raw, headerless rows for
+raw_tables, which caches them so a new header row is applied without parsing the workbook
+again.
+"""
+import os
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def excel_engine():
+    """The pandas read_excel engine to use, or None for pandas' default (openpyxl for .xlsx)."""
+    engine = os.environ.get("PIPELINE_EXCEL_ENGINE", "").strip().lower()
+    if engine:
+        return engine
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    return "calamine"
+
+def excel_sheet_names(path):
+    with pd.ExcelFile(path, engine=excel_engine()) as workbook:
+        return workbook.sheet_names
+
+def parse_raw_sheet(path, sheet_name=0):
+    """The sheet's rows as lists of cell values, with no header applied and no NA handling."""
+    engine = excel_engine()
+    raw = pd.read_excel(path, sheet_name=sheet_name, header=None, dtype=object, na_filter=False, engine=engine)
+    logger.info("Parsed sheet %r of %s with %s: %d rows", sheet_name, path, engine or "default engine", len(raw))
+    return raw.values.tolist()
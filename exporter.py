@@ -0,0 +1,187 @@
+"""
+Chunked export of result frames.
+
+export_frame writes a DataFrame to CSV/TXT (optionally gzip or zstd compressed), Parquet,
+Feather or Excel a chunk of rows at a time, reporting progress and checking for
+cancellation between chunks. Output column names are applied while writing, so the frame is
+never copied just to relabel it. Excel output uses openpyxl's write-only mode and starts a
+new sheet whenever one reaches Excel's row limit.
+"""
+import os
+import gzip
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_CHUNK_ROWS = 100_000
+EXCEL_MAX_ROWS = 1_048_576  # per sheet, including the header row
+
+# Compressed suffixes come first so "x.csv.gz" is not read as plain ".csv" by a looser match.
+EXPORT_SUFFIXES = [
+    (".csv.gz", "csv.gz"), (".txt.gz", "csv.gz"), (".csv.zst", "csv.zst"), (".txt.zst", "csv.zst"),
+    (".csv", "csv"), (".txt", "csv"), (".parquet", "parquet"), (".feather", "feather"),
+    (".arrow", "feather"), (".xlsx", "xlsx"),
+]
+
+# (file dialog filter label, suffix) for every export format, in the order the apps offer them.
+EXPORT_FILE_FILTERS = [
+    ("CSV Files", ".csv"), ("Compressed CSV", ".csv.gz"), ("Zstandard CSV", ".csv.zst"),
+    ("Text Files", ".txt"), ("Excel Files", ".xlsx"), ("Parquet Files", ".parquet"),
+    ("Feather Files", ".feather"),
+]
+
+def export_file_filter():
+    """Filter string for QFileDialog.getSaveFileName covering every export format."""
+    return ";;".join(f"{label} (*{suffix})" for label, suffix in EXPORT_FILE_FILTERS)
+
+def export_path_for(filename, selected_filter):
+    """Adds the selected filter's suffix unless the name already ends in a known export suffix."""
+    if filename.lower().endswith(tuple(suffix for suffix, _ in EXPORT_SUFFIXES)):
+        return filename
+    return filename + dict(EXPORT_FILE_FILTERS).get(selected_filter.split(" (")[0], ".csv")
+
+class ExportCancelled(Exception):
+    """Raised by export_frame when cancel_check() turns true; the partial file is removed."""
+
+def export_format_for(path):
+    name = path.lower()
+    for suffix, fmt in EXPORT_SUFFIXES:
+        if name.endswith(suffix):
+            return fmt
+    return "csv"
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def _open_text(path, fmt):
+    if fmt == "csv.gz":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if fmt == "csv.zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Zstandard CSV export needs the 'zstandard' package.")
+        return zstandard.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+def _write_csv(df, path, fmt, names, delimiter, chunk_rows, report):
+    with _open_text(path, fmt) as handle:
+        if len(df) == 0:
+            df.to_csv(handle, sep=delimiter, index=False, header=names)
+        for n, chunk in enumerate(_chunks(df, chunk_rows)):
+            chunk.to_csv(handle, sep=delimiter, index=False, header=names if n == 0 else False)
+            report(len(chunk))
+
+def _arrow_schema(df, names):
+    """Arrow schema of df under the output names, keeping the pandas metadata (e.g. Int64, category)."""
+    import pyarrow as pa
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    metadata = dict(schema.metadata or {})
+    if b"pandas" in metadata:
+        pandas_meta = json.loads(metadata[b"pandas"])
+        # preserve_index=False stores no index columns, so the entries line up with the fields.
+        for column, name in zip(pandas_meta["columns"], names):
+            column["name"] = column["field_name"] = name
+        metadata[b"pandas"] = json.dumps(pandas_meta).encode("utf-8")
+    return pa.schema([field.with_name(name) for field, name in zip(schema, names)], metadata=metadata)
+
+def _arrow_table(chunk, schema):
+    import pyarrow as pa
+    arrays = [pa.array(chunk.iloc[:, i], type=field.type, from_pandas=True) for i, field in enumerate(schema)]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def _write_parquet(df, path, names, chunk_rows, report):
+    import pyarrow.parquet as pq
+    schema = _arrow_schema(df, names)
+    with pq.ParquetWriter(path, schema) as writer:
+        if len(df) == 0:
+            writer.write_table(schema.empty_table())
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(_arrow_table(chunk, schema))
+            report(len(chunk))
+
+def _write_feather(df, path, names, chunk_rows, report):
+    import pyarrow as pa
+    schema = _arrow_schema(df, names)
+    # Uncompressed, so the file can be memory-mapped (see arrow_loading).
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(_arrow_table(chunk, schema))
+            report(len(chunk))
+
+def _excel_value(value):
+    if isinstance(value, pd.Timestamp):
+        # Excel has no time zones.
+        return (value.tz_localize(None) if value.tz is not None else value).to_pydatetime()
+    return value.item() if isinstance(value, np.generic) else value
+
+def _excel_rows(chunk):
+    values = chunk.to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    for row in values:
+        yield [_excel_value(value) for value in row]
+
+def _write_excel(df, path, names, chunk_rows, report, sheet_rows=EXCEL_MAX_ROWS):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    rows_per_sheet = sheet_rows - 1
+    sheet, sheet_count, rows_in_sheet = None, 0, rows_per_sheet
+    for chunk in _chunks(df, chunk_rows):
+        for row in _excel_rows(chunk):
+            if rows_in_sheet == rows_per_sheet:
+                sheet_count += 1
+                sheet = workbook.create_sheet(f"Sheet{sheet_count}")
+                sheet.append(names)
+                rows_in_sheet = 0
+            sheet.append(row)
+            rows_in_sheet += 1
+        report(len(chunk))
+    if sheet is None:
+        workbook.create_sheet("Sheet1").append(names)
+    workbook.save(path)
+    if sheet_count > 1:
+        logger.info("Excel export split into %d sheets of up to %d rows", sheet_count, rows_per_sheet)
+
+def export_frame(df, path, fmt=None, column_names=None, delimiter=",", chunk_rows=DEFAULT_EXPORT_CHUNK_ROWS,
+                 progress_callback=None, cancel_check=None):
+    """
+    Writes df to path in chunks of chunk_rows rows. fmt is one of csv, csv.gz, csv.zst,
+    parquet, feather or xlsx (default: from the file name). column_names relabels the
+    columns in the output. progress_callback(rows_written, total_rows) is called after every
+    chunk; when cancel_check() returns True the export stops with ExportCancelled.
+    """
+    fmt = fmt or export_format_for(path)
+    names = [str(name) for name in (column_names if column_names is not None else df.columns)]
+    if len(names) != df.shape[1]:
+        raise ValueError(f"{len(names)} column names given for {df.shape[1]} columns.")
+    total = len(df)
+    written = [0]
+
+    def report(rows):
+        written[0] += rows
+        if progress_callback is not None:
+            progress_callback(written[0], total)
+        if cancel_check is not None and cancel_check():
+            raise ExportCancelled(f"Export to {path} cancelled after {written[0]} rows")
+
+    try:
+        if fmt in ("csv", "csv.gz", "csv.zst"):
+            _write_csv(df, path, fmt, names, delimiter, chunk_rows, report)
+        elif fmt == "parquet":
+            _write_parquet(df, path, names, chunk_rows, report)
+        elif fmt == "feather":
+            _write_feather(df, path, names, chunk_rows, report)
+        elif fmt == "xlsx":
+            _write_excel(df, path, names, chunk_rows, report)
+        else:
+            raise ValueError(f"Unsupported export format '{fmt}'.")
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    logger.info("Exported %d rows to %s (%s)", total, path, fmt)
+    return total
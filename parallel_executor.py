@@ -0,0 +1,254 @@
+import os
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+import pandas as pd
+from transformations import (
+    apply_filters, apply_rename_columns, apply_transformation_step, order_transformation_steps,
+    validate_transformation_config, DEFERRED_TRANSFORMATIONS,
+)
+from pipeline_planner import compile_transformation_plan, execute_transformation_plan
+from streaming_executor import is_streamable_step
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_PARTITION_ROWS = 100_000
+
+# -------------------- Planning --------------------
+def _is_order_sensitive(key, info):
+    """Steps whose value for a row depends on the rows before or after it."""
+    if key == "Lag Column":
+        return True
+    return key == "Generate Unique IDs" and info.get("method", "sequence").strip().lower() == "sequence"
+
+def split_parallel_pipeline(config):
+    """
+    Splits the ordered transformation steps into (parallel, in_memory): the longest prefix
+    that can run on row partitions, and everything from the first barrier on. Deferred steps
+    (renames, join/union) are not part of either list.
+    """
+    steps = [step for step in order_transformation_steps(config.get("Transformations", {}))
+             if step[1] not in DEFERRED_TRANSFORMATIONS]
+    for i, (_, key, info) in enumerate(steps):
+        if not (key == "Lag Column" or is_streamable_step(key, info)):
+            return steps[:i], steps[i:]
+    return steps, []
+
+def _segments(steps):
+    """
+    Groups parallel steps so every order-sensitive step starts a new segment. Segment 0 (which
+    also runs the filters) never starts with one: its offsets and edges come from the
+    partition lengths and values after filtering, which only exist once a segment has run.
+    """
+    segments = [[]]
+    for step in steps:
+        if _is_order_sensitive(step[1], step[2]) and (segments[-1] or len(segments) == 1):
+            segments.append([])
+        segments[-1].append(step)
+    return segments
+
+def _lag_params(info):
+    """(column, periods, new_column) for a Lag Column step, or None if it cannot run."""
+    col_name = info.get("column")
+    periods = info.get("periods") or info.get("lag")
+    new_col = info.get("new_column") or (f"{col_name}_lag" if col_name else None)
+    if not col_name or not new_col or periods is None:
+        return None
+    try:
+        return col_name, int(periods), new_col
+    except (TypeError, ValueError):
+        return None
+
+# -------------------- Shared-memory transport --------------------
+def _to_shared(df):
+    """
+    Writes df into a new shared-memory block as an Arrow IPC stream and returns a payload
+    naming it. Frames Arrow cannot round-trip exactly (mixed-type or nested object columns,
+    duplicate or non-string column names) are returned as-is and pickled instead.
+    """
+    import pyarrow as pa
+    if len(set(df.columns)) != len(df.columns) or not all(isinstance(col, str) for col in df.columns):
+        return ("frame", df)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowException, ValueError, TypeError):
+        return ("frame", df)
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return ("frame", df)
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    buf = pa.py_buffer(shm.buf)
+    stream = pa.FixedSizeBufferWriter(buf)
+    writer = pa.ipc.new_stream(stream, table.schema)
+    writer.write_table(table)
+    writer.close()
+    stream.close()
+    # Every Arrow view of the block must be gone before it can be unmapped here.
+    del writer, stream, buf
+    shm.close()
+    return ("shm", shm.name, size)
+
+def _from_shared(payload):
+    """Reads a payload back into a DataFrame that owns its memory."""
+    if payload[0] == "frame":
+        return payload[1]
+    import pyarrow as pa
+    _, name, size = payload
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # One memcpy out of the block; to_pandas may keep zero-copy views of what it reads,
+        # which would otherwise pin the mapping.
+        data = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+def _release(payload):
+    if payload[0] == "shm":
+        try:
+            shm = shared_memory.SharedMemory(name=payload[1])
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+# -------------------- Worker --------------------
+def _apply_order_sensitive_step(df, key, info, boundary):
+    if key == "Generate Unique IDs":
+        df = apply_transformation_step(df, key, info)
+        new_col = info.get("new_column", "").strip()
+        if new_col in df.columns:
+            df[new_col] += boundary.get("row_offset", 0)
+        return df
+    params = _lag_params(info)
+    if params is None or params[0] not in df.columns:
+        return apply_transformation_step(df, key, info)
+    col_name, periods, new_col = params
+    before = boundary.get("before")
+    after = boundary.get("after")
+    before = before if before is not None else df[col_name].iloc[:0]
+    after = after if after is not None else df[col_name].iloc[:0]
+    # Shift with the neighbouring partitions' edge values so the first/last rows are not NaN.
+    extended = pd.concat([before, df[col_name], after], ignore_index=True).shift(periods)
+    df[new_col] = extended.iloc[len(before):len(before) + len(df)].to_numpy()
+    return df
+
+def _run_partition(payload, filters, steps, transformations, boundary, edge_request):
+    """
+    Runs one segment of steps on one partition in a worker process. Returns the result
+    payload, the row counts per step, the partition length and, when edge_request is
+    (column, n), the first and last n values of that column for the next segment.
+    """
+    df = _from_shared(payload)
+    summary = []
+    if filters is not None:
+        initial_count = len(df)
+        df = apply_filters(df, filters)
+        summary.append({"transformation": "Filters", "sequence": 1, "initial_count": initial_count, "new_count": len(df)})
+    if steps and _is_order_sensitive(steps[0][1], steps[0][2]):
+        sequence, key, info = steps[0]
+        initial_count = len(df)
+        df = _apply_order_sensitive_step(df, key, info, boundary)
+        summary.append({"transformation": key, "sequence": sequence, "initial_count": initial_count, "new_count": len(df)})
+        steps = steps[1:]
+    df = execute_transformation_plan(
+        df, compile_transformation_plan({key: info for _, key, info in steps}), transformations, summary)
+    edges = None
+    if edge_request is not None and edge_request[0] in df.columns:
+        col_name, n = edge_request
+        edges = (df[col_name].iloc[:n], df[col_name].iloc[len(df) - n:] if n else df[col_name].iloc[:0])
+    return _to_shared(df), summary, len(df), edges
+
+# -------------------- Driver --------------------
+def _boundary(step, lengths, edges, index):
+    """Row offset or lag halo for partition `index` from the other partitions' lengths/edges."""
+    _, key, info = step
+    if key == "Generate Unique IDs":
+        return {"row_offset": sum(lengths[:index])}
+    params = _lag_params(info)
+    if params is None:
+        return {}
+    periods = params[1]
+    need = abs(periods)
+    if periods > 0:
+        pieces = [e[1] for e in reversed(edges[:index]) if e is not None]
+        halo = pd.concat(list(reversed(pieces)), ignore_index=True) if pieces else None
+        return {"before": halo.iloc[max(len(halo) - need, 0):] if halo is not None else None}
+    pieces = [e[0] for e in edges[index + 1:] if e is not None]
+    halo = pd.concat(pieces, ignore_index=True) if pieces else None
+    return {"after": halo.iloc[:need] if halo is not None else None}
+
+def _edge_request(segment):
+    """(column, n) the partitions must report for the segment's leading Lag Column, if any."""
+    if not segment or segment[0][1] != "Lag Column":
+        return None
+    params = _lag_params(segment[0][2])
+    return (params[0], abs(params[1])) if params else None
+
+def _merge_summaries(partition_summaries):
+    totals = OrderedDict()
+    for summary in partition_summaries:
+        for entry in summary:
+            counts = totals.setdefault((entry["transformation"], entry["sequence"]), [0, 0])
+            counts[0] += entry["initial_count"]
+            counts[1] += entry["new_count"]
+    return [{"transformation": key, "sequence": sequence, "initial_count": c[0], "new_count": c[1]}
+            for (key, sequence), c in totals.items()]
+
+def apply_transformations_parallel(df, transformation_config, workers=None,
+                                   min_partition_rows=DEFAULT_MIN_PARTITION_ROWS):
+    """
+    Same result as apply_transformations_with_summary, but filters and the leading row-local
+    steps run on contiguous row partitions in a process pool. Partitions travel between
+    processes as Arrow buffers in shared memory and are concatenated back in order.
+    Generate Unique IDs ("sequence") and Lag Column start a new segment so each partition
+    gets the correct row offset or the edge values of its neighbours. Steps from the first
+    barrier on run in this process on the combined frame.
+    """
+    workers = workers or os.cpu_count() or 1
+    n_partitions = min(workers, len(df) // max(min_partition_rows, 1))
+    if n_partitions < 2:
+        from transformations import apply_transformations_with_summary
+        return apply_transformations_with_summary(df, transformation_config)
+    transformations = transformation_config.get("Transformations", {})
+    filters = transformation_config.get("Filters", [])
+    for problem in validate_transformation_config(transformations):
+        logger.warning("%s. Skipping.", problem)
+    parallel, in_memory = split_parallel_pipeline(transformation_config)
+    segments = _segments(parallel)
+    bounds = [len(df) * i // n_partitions for i in range(n_partitions + 1)]
+    payloads = [_to_shared(df.iloc[bounds[i]:bounds[i + 1]]) for i in range(n_partitions)]
+    partition_summaries = [[] for _ in range(n_partitions)]
+    logger.info("Running %d steps on %d partitions in %d segment(s), %d steps in memory",
+                len(parallel), n_partitions, len(segments), len(in_memory))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            lengths, edges = None, None
+            for n, segment in enumerate(segments):
+                next_request = _edge_request(segments[n + 1]) if n + 1 < len(segments) else None
+                futures = []
+                for i, payload in enumerate(payloads):
+                    boundary = _boundary(segment[0], lengths, edges, i) if n > 0 else {}
+                    futures.append(pool.submit(_run_partition, payload, filters if n == 0 else None,
+                                               segment, transformations, boundary, next_request))
+                results = [future.result() for future in futures]
+                for payload in payloads:
+                    _release(payload)
+                payloads = [result[0] for result in results]
+                for i, result in enumerate(results):
+                    partition_summaries[i].extend(result[1])
+                lengths = [result[2] for result in results]
+                edges = [result[3] for result in results]
+        df = pd.concat([_from_shared(payload) for payload in payloads])
+    finally:
+        for payload in payloads:
+            _release(payload)
+    summary = _merge_summaries(partition_summaries)
+    df = execute_transformation_plan(
+        df, compile_transformation_plan({key: info for _, key, info in in_memory}), transformations, summary)
+    df = apply_rename_columns(df, transformations)
+    return df, summary
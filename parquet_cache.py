@@ -0,0 +1,175 @@
+"""
+Content-addressed cache of Parquet (or uncompressed Feather) conversions of loaded source files.
+
+Converted files live in one managed directory (PIPELINE_CACHE_DIR, by default
+~/.cache/data_pipeline/parquet) under the hash of the source content plus the conversion
+options, so the same bytes are converted once whatever path they are opened from. A small
+index keyed by path, size and mtime lets an unchanged file skip hashing entirely. Writes go
+to a unique temporary file that is renamed into place, so concurrent loads never see a
+partial file, and the least recently used conversions are evicted past a size cap
+(PIPELINE_CACHE_MAX_BYTES, 10 GiB by default).
+"""
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Bump when the conversion output changes, so older cached files are no longer used.
+CACHE_FORMAT_VERSION = 2
+CACHE_SUFFIXES = (".parquet", ".feather")
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+# Entries used this recently are never evicted: another process may be about to read them.
+EVICTION_GRACE_SECONDS = 60
+STALE_TEMP_SECONDS = 24 * 3600
+
+def default_cache_dir():
+    return os.environ.get("PIPELINE_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "data_pipeline", "parquet")
+
+def file_digest(path, chunk_size=HASH_CHUNK_BYTES):
+    """BLAKE2b digest of a file's content, read in chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _key(*parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class ParquetConversionCache:
+    """Parquet conversions keyed by source content and options, with LRU eviction."""
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(self.cache_dir, "objects")
+        self.index_dir = os.path.join(self.cache_dir, "index")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def _object_path(self, content_key, suffix):
+        return os.path.join(self.objects_dir, content_key + suffix)
+
+    def _stat_key(self, path, suffix, options):
+        st = os.stat(path)
+        return _key(os.path.abspath(path), st.st_size, st.st_mtime_ns, suffix, options, CACHE_FORMAT_VERSION)
+
+    def _read_index(self, stat_key):
+        try:
+            with open(os.path.join(self.index_dir, stat_key), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _atomic_write(self, final_path, write):
+        tmp = f"{final_path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            write(tmp)
+            os.replace(tmp, final_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _write_index(self, stat_key, content_key):
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(content_key)
+        self._atomic_write(os.path.join(self.index_dir, stat_key), write)
+
+    def _touch(self, object_path):
+        try:
+            os.utime(object_path)
+            return True
+        except OSError:
+            return False
+
+    def lookup(self, path, suffix=".parquet", **options):
+        """Cached conversion path for an unchanged source file, or None. Never hashes or converts."""
+        content_key = self._read_index(self._stat_key(path, suffix, options))
+        if content_key:
+            object_path = self._object_path(content_key, suffix)
+            if self._touch(object_path):
+                return object_path
+        return None
+
+    def get_or_convert(self, path, convert, suffix=".parquet", **options):
+        """
+        Returns the cached conversion of `path` (a `suffix` file), calling convert(path,
+        output_path, **options) to create it when the content has not been converted with
+        these options.
+        """
+        stat_key = self._stat_key(path, suffix, options)
+        cached = self.lookup(path, suffix, **options)
+        if cached:
+            logger.info("Conversion cache hit for %s", path)
+            return cached
+        content_key = _key(file_digest(path), suffix, options, CACHE_FORMAT_VERSION)
+        object_path = self._object_path(content_key, suffix)
+        if self._touch(object_path):
+            logger.info("Conversion cache hit by content for %s", path)
+        else:
+            logger.info("Converting %s to %s", path, suffix)
+            self._atomic_write(object_path, lambda tmp: convert(path, tmp, **options))
+            self.evict(keep=object_path)
+        self._write_index(stat_key, content_key)
+        return object_path
+
+    def size(self):
+        return sum(os.path.getsize(os.path.join(self.objects_dir, name))
+                   for name in os.listdir(self.objects_dir) if name.endswith(CACHE_SUFFIXES))
+
+    def evict(self, keep=None):
+        """Removes least recently used conversions until the cache fits max_bytes."""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.objects_dir):
+            full = os.path.join(self.objects_dir, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            if name.endswith(".tmp"):
+                if now - st.st_mtime > STALE_TEMP_SECONDS:
+                    self._remove(full)
+            elif name.endswith(CACHE_SUFFIXES):
+                entries.append((st.st_mtime, st.st_size, full))
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, full in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if full == keep or now - mtime < EVICTION_GRACE_SECONDS:
+                continue
+            if self._remove(full):
+                total -= size
+        # Index entries pointing at evicted files are ignored by lookup and overwritten later.
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError as e:
+            logger.warning("Could not remove cached file %s: %s", path, e)
+            return False
+
+    def clear(self):
+        for directory in (self.objects_dir, self.index_dir):
+            for name in os.listdir(directory):
+                self._remove(os.path.join(directory, name))
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_conversion_cache():
+    """Process-wide cache in default_cache_dir(), sized by PIPELINE_CACHE_MAX_BYTES."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_bytes = int(os.environ.get("PIPELINE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+            _default_cache = ParquetConversionCache(max_bytes=max_bytes)
+        return _default_cache
@@ -1,5 +1,104 @@
+import re
 import json
-from transformations import apply_transformations_with_summary, apply_advanced_excel_transformations
+from transformations import apply_transformations_with_summary, validate_transformation_config
+from advanced_excel_transformations import apply_advanced_excel_transformations
+
+def transformations_from_config(config):
+    """
+    Returns the Transformations dict of a saved pipeline config, whether it was saved with
+    "Pipeline Steps" (ordered list of steps) or with direct "Transformations" parameters.
+    """
+    if "Pipeline Steps" in config:
+        transformations = {}
+        for step in sorted(config.get("Pipeline Steps", []), key=lambda x: x["order"]):
+            transformations[step["transformation"]] = step["parameters"]
+        return transformations
+    return config.get("Transformations", {})
+
+def column_registry_for(columns, transformations, positions=None):
+    """
+    Internal id -> output column name, built the way the GUI does on load: source columns
+    get col_1..col_n by position, and 'Rename Columns' internal mappings override the names.
+    positions gives the source position of each column when only some were read.
+    """
+    positions = range(len(columns)) if positions is None else positions
+    registry = {f"col_{pos+1}": str(col) for pos, col in zip(positions, columns)}
+    internal = transformations.get("Rename Columns", {}).get("internal", {})
+    registry.update({cid: name for cid, name in internal.items() if cid in registry})
+    return registry
+
+_COLUMN_ID = re.compile(r"\bcol_(\d+)\b")
+# Keys mapping every column id to a display name; they say nothing about what a step reads.
+_REGISTRY_KEYS = {"registry", "Column Registry"}
+# Steps that only rename columns: a column they mention is needed only if it is exported.
+_RENAME_STEPS = {"Rename Columns", "Rename Columns (Friendly)"}
+
+def _collect_column_ids(value, found):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in _REGISTRY_KEYS:
+                continue
+            _collect_column_ids(key, found)
+            _collect_column_ids(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_column_ids(item, found)
+    elif isinstance(value, str):
+        found.update(int(n) - 1 for n in _COLUMN_ID.findall(value))
+
+def _reads_every_column(key, info):
+    if key in ("Transpose Data", "Custom Function"):
+        return True
+    return key == "Unpivot Data" and not info.get("value_vars")
+
+def _drops_unlisted_columns(key, info):
+    """Steps whose output only holds the columns they name (or columns derived from them)."""
+    if key == "Group & Aggregate":
+        return bool(info.get("group_columns") and info.get("aggregations"))
+    if key == "Pivot Data":
+        return bool(info.get("index") and info.get("columns") and info.get("value_settings"))
+    return False
+
+def _dropped_positions(info, registry):
+    registry = {**registry, **info.get("registry", {})}
+    ids = {name: cid for cid, name in registry.items()}
+    dropped = set()
+    for friendly in info.get("columns_to_drop", []):
+        match = _COLUMN_ID.fullmatch(str(ids.get(friendly, friendly)))
+        if match:
+            dropped.add(int(match.group(1)) - 1)
+    return dropped
+
+def required_source_columns(config, n_columns):
+    """
+    Positions (0-based, ascending) of the source columns a saved pipeline config needs out of
+    n_columns: every column a filter, step or Advanced Excel Function refers to by its col_i
+    id, plus every column that reaches the output untouched. A column is left out only when
+    nothing reads it and it is dropped, either by Drop Columns or by a Group & Aggregate /
+    Pivot Data step that keeps only the columns it names. Anything the analysis cannot see
+    through (Transpose, Custom Function, Unpivot of all columns, SQL) needs every column.
+    """
+    every = list(range(n_columns))
+    transformations = transformations_from_config(config)
+    advanced = config.get("Advanced Excel Functions", {}) or {}
+    if advanced.get("sql_query", {}).get("query"):
+        return every
+    referenced = set()
+    _collect_column_ids(config.get("Filters", []), referenced)
+    _collect_column_ids(advanced, referenced)
+    dropped, reshaped = set(), False
+    for key, info in transformations.items():
+        if not isinstance(info, dict) or _reads_every_column(key, info):
+            return every
+        if key in _RENAME_STEPS:
+            continue
+        if key == "Drop Columns":
+            dropped |= _dropped_positions(info, config.get("Column Registry", {}))
+            continue
+        _collect_column_ids(info, referenced)
+        reshaped = reshaped or _drops_unlisted_columns(key, info)
+    exported = set() if reshaped else set(every) - dropped
+    return sorted(pos for pos in referenced | exported if pos < n_columns)
 
 class PipelineManager:
     def __init__(self):
@@ -23,6 +122,14 @@ class PipelineManager:
             pipeline[step["transformation"]] = step["parameters"]
         return pipeline
 
+    def validate_pipeline(self, transformation_params=None):
+        """
+        Checks the active steps (pipeline steps if loaded, otherwise the direct params)
+        against the transformation registry. Returns a list of problems.
+        """
+        transformations = self.get_pipeline() if self.pipeline_steps else (transformation_params or {})
+        return validate_transformation_config(transformations)
+
     def apply_pipeline(self, df, header_row, filter_conditions, advanced_excel_config, transformation_params):
         """
         Given an original DataFrame and the current configuration,
@@ -46,10 +153,12 @@ class PipelineManager:
         df_transformed = apply_advanced_excel_transformations(df_transformed, config["Advanced Excel Functions"])
         return df_transformed, summary_list
 
-    def save_pipeline_config(self, header_row, filter_conditions, advanced_excel_config, transformation_params, column_registry, filepath):
+    def save_pipeline_config(self, header_row, filter_conditions, advanced_excel_config, transformation_params, column_registry, filepath,
+                             column_dtypes=None):
         """
         Save the pipeline configuration to a JSON file.
         If pipeline steps exist, they are saved; otherwise direct transformation params are saved.
+        column_dtypes (internal id -> dtype) is saved when given, so later loads skip dtype inference.
         """
         if self.pipeline_steps:
             config = {
@@ -67,6 +176,8 @@ class PipelineManager:
                 "Advanced Excel Functions": advanced_excel_config,
                 "Column Registry": column_registry
             }
+        if column_dtypes:
+            config["Column Dtypes"] = column_dtypes
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=4)
 
@@ -0,0 +1,283 @@
+import logging
+from transformations import (
+    order_transformation_steps, apply_transformation_step, single_friendly_to_internal,
+    trim_series, change_case_series, replace_substring_series, left_series, right_series, mid_series,
+)
+
+logger = logging.getLogger(__name__)
+
+# Steps that only read/write named string columns and can share one astype(str) per column.
+FUSABLE_STRING_STEPS = {"Trim", "Change Case", "Replace Substring", "Find and Replace", "LEFT", "RIGHT", "MID"}
+
+# -------------------- Column usage --------------------
+def _dict_columns(info):
+    cols = info.get("columns", {})
+    return set(cols) if isinstance(cols, dict) else set()
+
+def _single(info, key="column"):
+    col = info.get(key)
+    return {col} if isinstance(col, str) and col else set()
+
+def _derived(info, default_suffix, key="column"):
+    """Reads `key`, writes `new_column` (defaulting to '<column>_<suffix>')."""
+    col = info.get(key)
+    if not col:
+        return set(), set()
+    return {col}, {info.get("new_column") or f"{col}_{default_suffix}"}
+
+def _derived_required(info, key="column"):
+    """Reads `key`, writes `new_column` which the step requires to be set."""
+    col = info.get(key)
+    new_col = info.get("new_column")
+    if not col or not new_col:
+        return set(), set()
+    return {col}, {new_col}
+
+def _in_place_dict(info):
+    cols = _dict_columns(info)
+    return cols, cols
+
+def _in_place(info, key="column"):
+    cols = _single(info, key)
+    return cols, cols
+
+def _extract_date_components(info):
+    col = info.get("column")
+    if not col:
+        return set(), set()
+    return {col}, {info.get("year", f"{col}_year"), info.get("month", f"{col}_month"), info.get("day", f"{col}_day")}
+
+# For each step: info -> (columns read, columns written). Every step listed here keeps
+# the row set and leaves all other columns untouched; anything not listed is a barrier.
+COLUMN_LOCAL_STEPS = {
+    "Trim": _in_place_dict,
+    "Change Case": _in_place_dict,
+    "Replace Substring": _in_place_dict,
+    "Convert Datatype": _in_place_dict,
+    "Find and Replace": _in_place,
+    "Fill Missing Values": _in_place,
+    "Standardize Date Format": _in_place,
+    "Normalize Data": _in_place,
+    "LEFT": lambda info: _derived(info, "left"),
+    "RIGHT": lambda info: _derived(info, "right"),
+    "MID": lambda info: _derived(info, "mid"),
+    "LEN": lambda info: _derived(info, "len"),
+    "Abs": lambda info: _derived(info, "abs"),
+    "Power": lambda info: _derived(info, "power"),
+    "Sqrt": lambda info: _derived(info, "sqrt"),
+    "Extract Substrings": lambda info: _derived(info, "substring"),
+    "Extract Text Between": lambda info: _derived(info, "extracted"),
+    "Extract Numeric Values": lambda info: _derived(info, "numeric"),
+    "Round Numbers": _derived_required,
+    "Date Shift": _derived_required,
+    "Next Working Day": _derived_required,
+    "Extract Date Components": _extract_date_components,
+}
+
+def step_column_usage(key, info):
+    """Returns (reads, writes) for a column-local step, or None if the step is a barrier."""
+    usage = COLUMN_LOCAL_STEPS.get(key)
+    if usage is None:
+        return None
+    return usage(info)
+
+def dropped_columns(info):
+    """Internal column ids removed by a Drop Columns step."""
+    registry = info.get("registry", {})
+    internal = [single_friendly_to_internal(friendly, registry) for friendly in info.get("columns_to_drop", [])]
+    return {col for col in internal if col}
+
+# -------------------- Optimizer passes --------------------
+def _eliminate_dead_steps(steps):
+    """
+    Marks column-local steps as dead when every column they write is dropped by a later
+    Drop Columns step before anything reads it.
+    """
+    dead = set()
+    for i, (_, key, info) in enumerate(steps):
+        usage = step_column_usage(key, info)
+        if usage is None or not usage[1]:
+            continue
+        pending = set(usage[1])
+        for _, later_key, later_info in steps[i + 1:]:
+            if later_key == "Drop Columns":
+                pending -= dropped_columns(later_info)
+                if not pending:
+                    dead.add(i)
+                    break
+                continue
+            later_usage = step_column_usage(later_key, later_info)
+            if later_usage is None or pending & later_usage[0]:
+                break
+            # A later step overwriting the column also makes this write unobservable.
+            pending -= later_usage[1] - later_usage[0]
+            if not pending:
+                dead.add(i)
+                break
+    return dead
+
+def _push_down_drops(steps, dead):
+    """
+    Moves each Drop Columns step before preceding column-local steps that never touch the
+    dropped columns. Dead steps never run, so a drop can always move past them.
+    Returns the reordered steps paired with their dead flag.
+    """
+    entries = [(step, i in dead) for i, step in enumerate(steps)]
+    for i in range(len(entries)):
+        (_, key, info), is_dead = entries[i]
+        if key != "Drop Columns" or is_dead:
+            continue
+        dropped = dropped_columns(info)
+        j = i
+        while j > 0:
+            (_, prev_key, prev_info), prev_dead = entries[j - 1]
+            if not prev_dead:
+                usage = step_column_usage(prev_key, prev_info)
+                if usage is None or dropped & (usage[0] | usage[1]):
+                    break
+            j -= 1
+        if j != i:
+            entries.insert(j, entries.pop(i))
+    return entries
+
+def compile_transformation_plan(transformation_config):
+    """
+    Turns a Transformations dict into an execution plan: a list of nodes, each one of
+      {"op": "step", "steps": [(sequence, key, info)]}
+      {"op": "fused_strings", "steps": [...]}  -- adjacent string steps run in one pass per column
+      {"op": "skip", "steps": [...]}           -- dead steps whose output is never observed
+    Filters are not part of the plan; they always run first, before any step.
+    """
+    steps = order_transformation_steps(transformation_config)
+    dead = _eliminate_dead_steps(steps)
+    plan = []
+    pending_skips = []
+    for step, is_dead in _push_down_drops(steps, dead):
+        if is_dead:
+            # Dead steps do not break a run of fusable steps; they are listed after it.
+            pending_skips.append(step)
+            continue
+        fusable = step[1] in FUSABLE_STRING_STEPS
+        if fusable and plan and plan[-1]["op"] == "fused_strings":
+            plan[-1]["steps"].append(step)
+            continue
+        if pending_skips:
+            plan.append({"op": "skip", "steps": pending_skips})
+            pending_skips = []
+        plan.append({"op": "fused_strings" if fusable else "step", "steps": [step]})
+    if pending_skips:
+        plan.append({"op": "skip", "steps": pending_skips})
+    for node in plan:
+        if node["op"] == "fused_strings" and len(node["steps"]) == 1:
+            node["op"] = "step"
+    if dead:
+        logger.info("Pipeline plan skips unused steps: %s", [steps[i][1] for i in sorted(dead)])
+    return plan
+
+# -------------------- Execution --------------------
+def _fused_string_ops(steps):
+    """Flattens fusable steps into (op, source_column, target_column, params) tuples, in order."""
+    ops = []
+    for _, key, info in steps:
+        if key == "Trim":
+            for col, settings in info.get("columns", {}).items():
+                ops.append(("trim", col, col, settings))
+        elif key == "Change Case":
+            for col, conversion in info.get("columns", {}).items():
+                ops.append(("case", col, col, conversion))
+        elif key == "Replace Substring":
+            for col, settings in info.get("columns", {}).items():
+                if settings.get("old_sub") is None or settings.get("new_sub") is None:
+                    logger.warning(f"Replace Substring: Missing parameters for column '{col}'. Skipping...")
+                    continue
+                ops.append(("replace", col, col, settings))
+        elif key == "Find and Replace":
+            col = info.get("column")
+            if col and info.get("find") is not None and info.get("replace") is not None:
+                ops.append(("find_replace", col, col, {"old_sub": info.get("find"), "new_sub": info.get("replace")}))
+            else:
+                logger.warning("Find and Replace: missing required parameters.")
+        elif key in ("LEFT", "RIGHT", "MID"):
+            col = info.get("column")
+            if not col:
+                logger.warning("%s: missing column.", key)
+                continue
+            new_col = info.get("new_column", f"{col}_{key.lower()}")
+            ops.append((key.lower(), col, new_col, info))
+    return ops
+
+def _run_fused_strings(df, steps):
+    ops = _fused_string_ops(steps)
+    # Fall back to the per-step path (with its own warnings/errors) when a source column is missing.
+    available = set(df.columns)
+    for _, source, target, _ in ops:
+        if source not in available:
+            for _, key, info in steps:
+                df = apply_transformation_step(df, key, info)
+            return df
+        available.add(target)
+    strings = {}
+    dirty = []
+    for op, source, target, params in ops:
+        s = strings[source] if source in strings else df[source].astype(str)
+        if op == "trim":
+            s = trim_series(s, params)
+        elif op == "case":
+            converted = change_case_series(s, params)
+            if converted is None:
+                logger.warning("Unknown case conversion method: %s for column %s", params, source)
+                continue
+            s = converted
+        elif op == "replace":
+            s = replace_substring_series(s, params)
+        elif op == "find_replace":
+            # Same contract as apply_transform_find_replace: a bad pattern is logged and the column left as it was.
+            try:
+                s = replace_substring_series(s, params)
+            except Exception as e:
+                logger.error("Find and Replace error for column %s: %s", source, e)
+                continue
+        elif op == "left":
+            s = left_series(s, params.get("num_chars", 1))
+        elif op == "right":
+            s = right_series(s, params.get("num_chars", 1))
+        elif op == "mid":
+            s = mid_series(s, params.get("start", 0), params.get("num_chars", None))
+        strings[target] = s
+        if target not in dirty:
+            dirty.append(target)
+    for col in dirty:
+        df[col] = strings[col]
+    return df
+
+def execute_transformation_plan(df, plan, transformation_config, summary=None):
+    """
+    Runs a compiled plan. When a summary list is given, one entry per original step is
+    appended (fused and skipped steps keep their own entries and sequence numbers).
+    Like the summary path always has, each step is given only its own config ({key: info}),
+    so Drop Columns does not refuse to drop a column an earlier step has already consumed.
+    """
+    for node in plan:
+        init_count = len(df)
+        if node["op"] == "fused_strings":
+            df = _run_fused_strings(df, node["steps"])
+        elif node["op"] == "step":
+            _, key, info = node["steps"][0]
+            df = apply_transformation_step(df, key, info, {key: info})
+        if summary is not None:
+            for sequence, key, _ in node["steps"]:
+                summary.append({
+                    "transformation": key,
+                    "sequence": sequence,
+                    "initial_count": init_count,
+                    "new_count": len(df)
+                })
+    return df
+
+def describe_plan(plan):
+    """Readable one-line-per-node description of a plan, for logging and debugging."""
+    lines = []
+    for node in plan:
+        keys = ", ".join(key for _, key, _ in node["steps"])
+        lines.append(f"{node['op']}: {keys}")
+    return "\n".join(lines)
@@ -0,0 +1,92 @@
+import threading
+try:
+    from PyQt6.QtCore import QThread, pyqtSignal
+except ImportError:
+    from PyQt5.QtCore import QThread, pyqtSignal
+from step_cache import run_pipeline_incremental, PipelineCancelled
+from advanced_transformations import apply_join_and_union
+from exporter import export_frame, ExportCancelled
+
+class PipelineWorker(QThread):
+    """
+    Runs a full pipeline (filters, steps, Advanced Excel Functions, join/union) off the
+    GUI thread. Every signal carries the run's generation so the window can drop results
+    from runs that were superseded by a newer config.
+    """
+    progress = pyqtSignal(int, int, int, str)            # generation, done, total, stage name
+    result_ready = pyqtSignal(int, object, object, object)  # generation, df, summary, errors
+    failed = pyqtSignal(int, str)
+    cancelled = pyqtSignal(int)
+
+    def __init__(self, generation, df, config, cache, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.df = df
+        self.config = config
+        self.cache = cache
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Requests a stop; the run ends at the next stage boundary."""
+        self._cancel.set()
+
+    def run(self):
+        try:
+            df, summary = run_pipeline_incremental(
+                self.df, self.config, self.cache,
+                progress_callback=lambda done, total, name: self.progress.emit(self.generation, done, total, name),
+                cancel_check=self._cancel.is_set,
+            )
+            if self._cancel.is_set():
+                raise PipelineCancelled("Cancelled before join/union")
+            df, errors = apply_join_and_union(df, self.config.get("Transformations", {}), summary)
+            self.result_ready.emit(self.generation, df, summary, errors)
+        except PipelineCancelled:
+            self.cancelled.emit(self.generation)
+        except Exception as e:
+            self.failed.emit(self.generation, str(e))
+
+class ExportWorker(QThread):
+    """Writes a frame to disk in chunks off the GUI thread (see exporter.export_frame)."""
+    progress = pyqtSignal(int, int)   # rows written, total rows
+    result_ready = pyqtSignal(str)    # path written
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, df, path, parent=None, **options):
+        super().__init__(parent)
+        self.df = df
+        self.path = path
+        self.options = options
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Requests a stop; the export ends after the current chunk and the partial file is removed."""
+        self._cancel.set()
+
+    def run(self):
+        try:
+            export_frame(self.df, self.path, progress_callback=self.progress.emit,
+                         cancel_check=self._cancel.is_set, **self.options)
+            self.result_ready.emit(self.path)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class TaskWorker(QThread):
+    """Runs func(*args, **kwargs) off the GUI thread and emits its return value."""
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            self.result_ready.emit(self.func(*self.args, **self.kwargs))
+        except Exception as e:
+            self.failed.emit(str(e))
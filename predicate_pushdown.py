@@ -0,0 +1,187 @@
+import os
+import logging
+import pandas as pd
+from arrow_loading import ARROW_IPC_EXTENSIONS
+from csv_ingest import read_csv_fast
+from transformations import (
+    compile_filter_mask, parse_between_range, parse_date, parse_date_range, parse_in_list,
+)
+
+logger = logging.getLogger(__name__)
+
+# -------------------- Filters -> Arrow expressions --------------------
+def _is_numeric(arrow_type):
+    import pyarrow as pa
+    return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+
+def _is_text(arrow_type):
+    import pyarrow as pa
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+def _is_naive_timestamp(arrow_type):
+    import pyarrow as pa
+    return pa.types.is_timestamp(arrow_type) and arrow_type.tz is None
+
+def _number(val):
+    """Parses a comparison value the way apply_filters does ('.' means float)."""
+    return float(val) if '.' in str(val) else int(val)
+
+def condition_expression(field_name, arrow_type, cond, val):
+    """
+    Arrow expression keeping at least every row the filter condition keeps in pandas, or None
+    when the condition cannot be expressed that way (it then prunes nothing).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    field = pc.field(field_name)
+    if cond == "Null":
+        return field.is_null(nan_is_null=True)
+    if cond == "Not Null":
+        return ~field.is_null(nan_is_null=True)
+    if val is None:
+        return None
+    try:
+        if cond == "Equals":
+            if _is_text(arrow_type) and isinstance(val, str):
+                return field == val
+            if _is_numeric(arrow_type) and isinstance(val, (int, float)) and not isinstance(val, bool):
+                return field == val
+        elif cond in ("In List", "Not In List"):
+            if cond == "Not In List":
+                return None
+            items = parse_in_list(val)
+            if _is_text(arrow_type):
+                return field.isin(pa.array([str(x) for x in items], type=pa.string()))
+            if _is_numeric(arrow_type):
+                values = pa.array([float(_number(x)) for x in items], type=pa.float64())
+                return field.cast(pa.float64()).isin(values)
+        elif cond in ("Greater Than", "Less Than") and _is_numeric(arrow_type):
+            cmpval = _number(val)
+            return field > cmpval if cond == "Greater Than" else field < cmpval
+        elif cond == "Between" and _is_numeric(arrow_type):
+            lower, upper = parse_between_range(val)
+            if lower is not None and upper is not None:
+                return (field >= lower) & (field <= upper)
+        elif cond in ("Date Before", "Date After") and _is_naive_timestamp(arrow_type):
+            cmp_date = parse_date(val)
+            if pd.notnull(cmp_date):
+                scalar = pa.scalar(cmp_date.to_pydatetime(), type=arrow_type)
+                return field < scalar if cond == "Date Before" else field > scalar
+        elif cond == "Date Between" and _is_naive_timestamp(arrow_type):
+            d1, d2 = parse_date_range(val)
+            if pd.notnull(d1) and pd.notnull(d2):
+                return ((field >= pa.scalar(d1.to_pydatetime(), type=arrow_type))
+                        & (field <= pa.scalar(d2.to_pydatetime(), type=arrow_type)))
+    except (ValueError, TypeError, pa.ArrowException) as e:
+        logger.debug("Not pushing down %s on '%s': %s", cond, field_name, e)
+    return None
+
+_UNSET = object()
+
+def _fold(acc, expr, logic):
+    """Combines two pushed predicates; None stands for 'keeps every row'."""
+    if acc is _UNSET:
+        return expr
+    if logic == "OR":
+        return None if acc is None or expr is None else acc | expr
+    if acc is None:
+        return expr
+    return acc if expr is None else acc & expr
+
+def filters_to_expression(filter_conditions, schema, column_map=None):
+    """
+    Translates a Filters config into one Arrow expression for a dataset with `schema`, or
+    None when nothing can be pushed down. Groups and conditions fold with the same AND/OR
+    logic as compile_filter_mask; conditions that cannot be translated count as 'keep every
+    row', so the expression never drops a row the full filter would keep. column_map maps
+    the column names used in the filters (e.g. col_1) to field names in the file.
+    """
+    column_map = column_map or {}
+    types = {name: schema.field(name).type for name in schema.names}
+    final = _UNSET
+    for group in filter_conditions or []:
+        if not isinstance(group, dict) or "conditions" not in group or "group_logic" not in group:
+            continue
+        group_logic = group.get("group_logic", "AND").upper()
+        group_expr = _UNSET
+        current_logic = None
+        for condition in group.get("conditions", []):
+            if isinstance(condition, str) and condition.upper() in ["AND", "OR"]:
+                current_logic = condition.upper()
+                continue
+            if isinstance(condition, dict):
+                col, cond, val = condition.get("col"), condition.get("cond"), condition.get("value")
+                row_logic = condition.get("row_logic", "").upper()
+                if row_logic in ["AND", "OR"]:
+                    current_logic = row_logic
+            elif isinstance(condition, tuple) and len(condition) == 3:
+                col, cond, val = condition
+            else:
+                continue
+            field_name = column_map.get(col, col)
+            if field_name not in types:
+                continue
+            group_expr = _fold(group_expr, condition_expression(field_name, types[field_name], cond, val),
+                               current_logic or "AND")
+        final = _fold(final, None if group_expr is _UNSET else group_expr, group_logic)
+    return None if final is _UNSET else final
+
+def positional_column_map(names):
+    """col_1..col_n -> file column names, matching the ids the GUI assigns on load."""
+    return {f"col_{i+1}": str(name) for i, name in enumerate(names)}
+
+# -------------------- Filtered reads --------------------
+def source_column_names(path, header=0, delimiter=","):
+    """Column names of a CSV/TXT, Parquet or Feather source without reading its rows, or None for other formats."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    if ext in ARROW_IPC_EXTENSIONS:
+        import pyarrow as pa
+        return list(pa.ipc.open_file(pa.memory_map(path, "r")).schema.names)
+    if ext in [".csv", ".txt"]:
+        return list(pd.read_csv(path, header=header, delimiter=delimiter, nrows=0).columns)
+    return None
+
+def read_parquet_filtered(path, filter_conditions, column_ids=False, columns=None):
+    """
+    Reads a Parquet file keeping only rows that can pass the filters: the pushed-down
+    predicate is evaluated by the Arrow dataset scanner, which skips row groups whose
+    statistics cannot match and only decodes the remaining ones. The full filters must
+    still be applied afterwards. columns (names) limits which columns are read.
+    """
+    import pyarrow.dataset as ds
+    dataset = ds.dataset(path, format="parquet")
+    column_map = positional_column_map(dataset.schema.names) if column_ids else None
+    expression = filters_to_expression(filter_conditions, dataset.schema, column_map)
+    if expression is not None:
+        logger.info("Pushing filter into Parquet scan: %s", expression)
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+def read_csv_filtered(path, filter_conditions, header=0, delimiter=",", column_ids=False, usecols=None):
+    """
+    Reads a CSV with read_csv_fast, so every column gets the type an unfiltered read gives
+    it, and keeps only the rows that pass the filters. When Arrow parses the file the
+    pushed-down predicate is evaluated on the Arrow table and only the rows it keeps are
+    converted to pandas. The result equals the full read .loc[mask], row labels included.
+    column_ids means the filters name columns col_1..col_n; usecols (column positions)
+    limits which columns are read.
+    """
+    ids = [f"col_{pos+1}" for pos in sorted(usecols)] if usecols is not None else None
+
+    def pushed_mask(table):
+        import pyarrow.dataset as ds
+        column_map = dict(zip(ids, table.schema.names)) if ids else positional_column_map(table.schema.names)
+        expression = filters_to_expression(filter_conditions, table.schema, column_map if column_ids else None)
+        if expression is None:
+            return None
+        logger.info("Pushing filter into CSV read: %s", expression)
+        return ds.dataset(table).to_table(columns={"keep": expression}).column("keep")
+
+    df = read_csv_fast(path, header=header, delimiter=delimiter, usecols=usecols, row_mask=pushed_mask)
+    view = df
+    if column_ids:
+        view = df.set_axis(ids or list(positional_column_map(df.columns)), axis=1)
+    mask = compile_filter_mask(view, filter_conditions)
+    return df if mask is None else df.loc[mask]
@@ -0,0 +1,80 @@
+"""
+Header selection without re-reading the source file.
+
+raw_rows reads an Excel sheet once into its raw, headerless rows (lists of cell values,
+before any NA handling or type inference); raw_bytes reads a CSV/TXT file once into memory.
+Both are kept in a small in-process cache keyed by path, size, modification time and sheet.
+read_with_header then applies a header row without touching the disk: Excel rows are
+re-sliced and re-typed with pandas' TextParser, the step pd.read_excel runs after parsing a
+sheet, and text files are parsed again from the cached bytes with csv_ingest.read_csv_fast,
+whose multi-threaded parse is several times faster than re-typing Python rows and whose
+input takes no more memory than the file. Trying several header rows on a messy source
+therefore costs one read of it, not one per attempt.
+"""
+import os
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+from pandas.io.parsers import TextParser
+from csv_ingest import read_csv_fast
+from excel_ingest import parse_raw_sheet
+
+logger = logging.getLogger(__name__)
+
+TEXT_EXTENSIONS = (".csv", ".txt")
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+RAW_TABLE_EXTENSIONS = TEXT_EXTENSIONS + EXCEL_EXTENSIONS
+MAX_CACHED_TABLES = 4
+
+_raw_cache = OrderedDict()
+_raw_cache_lock = threading.Lock()
+
+def _cached(path, part, load):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, part)
+    with _raw_cache_lock:
+        value = _raw_cache.get(key)
+        if value is not None:
+            _raw_cache.move_to_end(key)
+            return value
+    value = load()
+    with _raw_cache_lock:
+        _raw_cache[key] = value
+        while len(_raw_cache) > MAX_CACHED_TABLES:
+            _raw_cache.popitem(last=False)
+    return value
+
+def raw_rows(path, sheet_name=0):
+    """
+    The Excel sheet's rows as lists of raw cell values. The workbook is only parsed when the
+    sheet is not already cached (or the file has changed since it was).
+    """
+    return _cached(path, ("sheet", sheet_name), lambda: parse_raw_sheet(path, sheet_name))
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def raw_bytes(path):
+    """The CSV/TXT file's contents, read from disk only when not already cached."""
+    return _cached(path, ("bytes",), lambda: _read_bytes(path))
+
+def frame_from_rows(rows, header=0, usecols=None):
+    """Applies a header row (and column positions) to raw rows, inferring column types like pd.read_excel."""
+    if not rows:
+        return pd.DataFrame()
+    return TextParser(rows, header=header, usecols=usecols).read()
+
+def read_with_header(path, header=0, delimiter=",", sheet_name=0, usecols=None):
+    """
+    Reads a CSV/TXT or Excel source with the given header row. Excel sheets are served from
+    the raw-row cache, text files are parsed with read_csv_fast from their cached bytes.
+    """
+    if os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS:
+        return read_csv_fast(raw_bytes(path), header=header, delimiter=delimiter, usecols=usecols)
+    return frame_from_rows(raw_rows(path, sheet_name), header=header, usecols=usecols)
+
+def clear_raw_cache():
+    with _raw_cache_lock:
+        _raw_cache.clear()
@@ -0,0 +1,189 @@
+import json
+import uuid
+import hashlib
+import logging
+import weakref
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from transformations import (
+    apply_filters, apply_rename_columns, validate_transformation_config, convert_tuple_keys_to_str,
+    CONFIG_AWARE_TRANSFORMATIONS,
+)
+from pipeline_planner import compile_transformation_plan, execute_transformation_plan
+from advanced_excel_transformations import apply_advanced_excel_transformations
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BUDGET_BYTES = 2 * 1024 ** 3
+PREVIEW_SAMPLE_ROWS = 5000
+
+class PipelineCancelled(Exception):
+    """Raised between stages when a run is cancelled."""
+
+def canonicalize_params(params):
+    """Stable text form of a step's parameters (dict key order and tuple keys do not matter)."""
+    return json.dumps(convert_tuple_keys_to_str(params), sort_keys=True, default=repr)
+
+def preview_sample(df, n_rows=PREVIEW_SAMPLE_ROWS, method="head"):
+    """
+    Rows used for interactive preview runs. "head" keeps the first n_rows; "spread" takes
+    n_rows evenly spaced rows so later parts of the file are represented. Returns df itself
+    when it is already small enough.
+    """
+    if len(df) <= n_rows:
+        return df
+    if method == "spread":
+        positions = np.linspace(0, len(df) - 1, n_rows).astype(np.int64)
+        return df.iloc[positions]
+    return df.iloc[:n_rows]
+
+def frame_nbytes(df):
+    """
+    Approximate memory held by a cached copy. Shallow per-column sizes are used on purpose:
+    a copy of an object column duplicates the pointer array, not the Python strings.
+    """
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+class StepResultCache:
+    """
+    LRU cache of intermediate pipeline results keyed by a chained hash of
+    (input fingerprint, step name, canonicalized parameters) for every stage so far.
+    Entries are private copies, so callers may mutate what they get back.
+    Safe to share between the GUI thread and a background worker.
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_BUDGET_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> (df, summary, nbytes)
+        self._total_bytes = 0
+        self._fingerprints = {}  # id(df) -> (weakref to df, fingerprint)
+
+    def fingerprint(self, df):
+        """Content fingerprint of a source frame, computed once per frame object."""
+        with self._lock:
+            return self._fingerprint(df)
+
+    def _fingerprint(self, df):
+        known = self._fingerprints.get(id(df))
+        if known is not None and known[0]() is df:
+            return known[1]
+        h = hashlib.sha1()
+        h.update(repr((df.shape, list(map(str, df.columns)), list(map(str, df.dtypes)))).encode("utf-8"))
+        try:
+            h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        except TypeError:
+            # Unhashable cells (lists/dicts from JSON sources): only this frame object can match.
+            h.update(uuid.uuid4().bytes)
+        fp = h.hexdigest()
+        self._fingerprints = {k: v for k, v in self._fingerprints.items() if v[0]() is not None}
+        self._fingerprints[id(df)] = (weakref.ref(df), fp)
+        return fp
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return entry[0].copy(), list(entry[1])
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, df, summary):
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return
+        snapshot = df.copy()
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[2]
+            self._entries[key] = (snapshot, list(summary), nbytes)
+            self._total_bytes += nbytes
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+def _chain_key(prev_key, name, params):
+    return hashlib.sha1(f"{prev_key}|{name}|{canonicalize_params(params)}".encode("utf-8")).hexdigest()
+
+def _build_stages(config):
+    """Splits a pipeline config into (name, params, func) stages; func(df, summary) -> df."""
+    filters = config.get("Filters", [])
+    transformations = config.get("Transformations", {})
+    advanced = config.get("Advanced Excel Functions", {})
+
+    def run_filters(df, summary):
+        initial_count = len(df)
+        df = apply_filters(df, filters)
+        summary.append({"transformation": "Filters", "sequence": 1, "initial_count": initial_count, "new_count": len(df)})
+        return df
+
+    stages = [("Filters", filters, run_filters)]
+    for node in compile_transformation_plan(transformations):
+        def run_node(df, summary, node=node):
+            return execute_transformation_plan(df, [node], transformations, summary)
+        params = [[seq, key, info] for seq, key, info in node["steps"]]
+        if any(key in CONFIG_AWARE_TRANSFORMATIONS for _, key, _ in node["steps"]):
+            # e.g. Drop Columns validates against every other step, so all of them are inputs.
+            params = [params, transformations]
+        label = ", ".join(key for _, key, _ in node["steps"])
+        stages.append((label, params, run_node))
+    renames = {k: v for k, v in transformations.items() if k in ("Rename Columns", "Rename Columns (Friendly)")}
+    stages.append(("Rename", renames, lambda df, summary: apply_rename_columns(df, transformations)))
+    stages.append(("Advanced Excel Functions", advanced,
+                   lambda df, summary: apply_advanced_excel_transformations(df, advanced)))
+    return stages
+
+def run_pipeline_incremental(df, config, cache, progress_callback=None, cancel_check=None):
+    """
+    Same result as apply_transformations_with_summary followed by
+    apply_advanced_excel_transformations, but resumes from the last cached stage:
+    editing step N only re-runs the stages from N to the end.
+    progress_callback(done, total, stage_name) is called before each stage that runs;
+    when cancel_check() returns True the run stops between stages with PipelineCancelled.
+    The input frame is never modified. Returns (df, summary).
+    """
+    for problem in validate_transformation_config(config.get("Transformations", {})):
+        logger.warning("%s. Skipping.", problem)
+    stages = _build_stages(config)
+    keys = []
+    prev_key = cache.fingerprint(df)
+    for name, params, _ in stages:
+        prev_key = _chain_key(prev_key, name, params)
+        keys.append(prev_key)
+    # One get() per probe: a clear() from another thread between a membership test and the
+    # fetch would otherwise leave nothing to resume from.
+    start, cached = 0, None
+    for i in range(len(keys) - 1, -1, -1):
+        cached = cache.get(keys[i])
+        if cached is not None:
+            start = i + 1
+            break
+    if cached is not None:
+        df, summary = cached
+    else:
+        df, summary = df.copy(), []
+    logger.info("Incremental run: reusing %d of %d stages", start, len(stages))
+    for i in range(start, len(stages)):
+        if cancel_check is not None and cancel_check():
+            raise PipelineCancelled(f"Cancelled before stage '{stages[i][0]}'")
+        if progress_callback is not None:
+            progress_callback(i, len(stages), stages[i][0])
+        df = stages[i][2](df, summary)
+        cache.put(keys[i], df, summary)
+    if progress_callback is not None:
+        progress_callback(len(stages), len(stages), "Done")
+    return df, summary
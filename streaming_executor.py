@@ -0,0 +1,384 @@
+import os
+import logging
+import tempfile
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from transformations import (
+    apply_filters, apply_rename_columns, order_transformation_steps, validate_transformation_config,
+    DEFERRED_TRANSFORMATIONS,
+)
+from pipeline_planner import compile_transformation_plan, execute_transformation_plan
+from advanced_excel_transformations import apply_advanced_excel_transformations
+from advanced_transformations import apply_join_and_union
+from pipeline_manager import column_registry_for, required_source_columns
+from predicate_pushdown import filters_to_expression, positional_column_map, source_column_names
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 250_000
+
+def _default_barrier_limit():
+    """Half the physical memory where the OS reports it, else None (no limit)."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+class BarrierInputTooLarge(ValueError):
+    pass
+
+_UNSET_LIMIT = object()
+
+# -------------------- Streamability --------------------
+def _always(info):
+    return True
+
+def _fill_missing_streamable(info):
+    # Forward/backward fill cross chunk boundaries; mean/median need the whole column.
+    return info.get("method", "Constant") == "Constant"
+
+def _convert_datatype_streamable(info):
+    # Each chunk would get its own set of categories.
+    return all(str(settings.get("new_type", "")).strip().lower() != "category"
+               for settings in info.get("columns", {}).values())
+
+# For each step: info -> True when the step only looks at the row it is computing, so running
+# it chunk by chunk gives the same rows as running it on the whole frame. Anything not listed
+# (Sort, Pivot, Group & Aggregate, Remove Duplicates, windowed analytics, ...) is a barrier.
+# Steps that parse text dates (Standardize Date Format, Date Shift, Next Working Day, Extract
+# Date Components) are barriers too: pd.to_datetime infers the format, or falls back from a
+# given one, from the values it sees, so per-chunk parsing would depend on the chunk size.
+STREAMABLE_STEPS = {
+    "Trim": _always,
+    "Change Case": _always,
+    "Replace Substring": _always,
+    "Find and Replace": _always,
+    "LEFT": _always,
+    "RIGHT": _always,
+    "MID": _always,
+    "LEN": _always,
+    "Abs": _always,
+    "Power": _always,
+    "Sqrt": _always,
+    "Extract Substrings": _always,
+    "Extract Text Between": _always,
+    "Extract Numeric Values": _always,
+    "Round Numbers": _always,
+    "Flag Missing Values": _always,
+    "Concatenate Columns": _always,
+    "Conditional Column Creation": _always,
+    "Drop Columns": _always,
+    "Drop Unnamed Columns": _always,
+    "Generate Unique IDs": _always,  # "sequence" is offset per chunk, see _run_streamed_steps
+    "Fill Missing Values": _fill_missing_streamable,
+    "Convert Datatype": _convert_datatype_streamable,
+}
+
+def is_streamable_step(key, info):
+    check = STREAMABLE_STEPS.get(key)
+    return check is not None and check(info)
+
+def split_streaming_pipeline(config):
+    """
+    Splits the ordered transformation steps into (streamed, in_memory): the longest prefix of
+    streamable steps, and everything from the first barrier on. Filters are always a per-row
+    mask, so they always stream. Deferred steps (renames, join/union) are not part of either
+    list; they always run at the end.
+    """
+    steps = [step for step in order_transformation_steps(config.get("Transformations", {}))
+             if step[1] not in DEFERRED_TRANSFORMATIONS]
+    for i, (_, key, info) in enumerate(steps):
+        if not is_streamable_step(key, info):
+            return steps[:i], steps[i:]
+    return steps, []
+
+# -------------------- Chunked I/O --------------------
+def _unify_dtypes(a, b):
+    if a == b:
+        return a
+    if a.kind in "iuf" and b.kind in "iuf":
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+def csv_chunk_dtypes(path, chunk_rows=DEFAULT_CHUNK_ROWS, header=0, delimiter=",", positions=None):
+    """
+    dtype= map for columns whose inferred type differs between chunks of a chunked CSV read,
+    unified the way a single full read would see them (ints with gaps or floats elsewhere
+    become float64, anything else mixed becomes object). Costs one extra streaming parse;
+    an empty dict means every chunk agrees.
+    """
+    dtypes, changed = {}, set()
+    for chunk in pd.read_csv(path, header=header, delimiter=delimiter, chunksize=chunk_rows, usecols=positions):
+        for col, dtype in chunk.dtypes.items():
+            if col not in dtypes:
+                dtypes[col] = dtype
+            elif dtype != dtypes[col]:
+                dtypes[col] = _unify_dtypes(dtypes[col], dtype)
+                changed.add(col)
+    return {col: dtypes[col] for col in changed}
+
+def iter_source_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, header=0, delimiter=",", filters=None,
+                       column_ids=False, positions=None):
+    """
+    Yields the source file as DataFrames of at most chunk_rows rows. Row labels continue
+    across chunks, as they would in a single full read. For Parquet, filters are pushed into
+    the scan (see predicate_pushdown) so row groups that cannot match are never decoded;
+    the chunks must still be filtered exactly afterwards. positions limits the columns read.
+    CSV/TXT columns get the same dtype in every chunk (see csv_chunk_dtypes), so a Parquet
+    output schema fixed from the first chunk holds for the rest of the file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".csv", ".txt"]:
+        dtypes = csv_chunk_dtypes(path, chunk_rows, header, delimiter, positions)
+        if dtypes:
+            logger.info("Column types differ between chunks, reading as %s", {col: str(t) for col, t in dtypes.items()})
+        yield from pd.read_csv(path, header=header, delimiter=delimiter, chunksize=chunk_rows, usecols=positions,
+                               dtype=dtypes or None)
+    elif ext == ".parquet":
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(path, format="parquet")
+        column_map = positional_column_map(dataset.schema.names) if column_ids else None
+        expression = filters_to_expression(filters, dataset.schema, column_map)
+        columns = None if positions is None else [dataset.schema.names[pos] for pos in positions]
+        offset = 0
+        for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=chunk_rows):
+            if batch.num_rows == 0:
+                continue
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+        if offset == 0:
+            yield dataset.schema.empty_table().to_pandas()[columns or dataset.schema.names]
+    else:
+        raise ValueError(f"Streaming supports CSV, TXT and Parquet sources, not '{ext}'.")
+
+class ChunkedFileWriter:
+    """Appends DataFrame chunks to one CSV/TXT or Parquet file. Use as a context manager."""
+    def __init__(self, path, delimiter=","):
+        self.path = path
+        self.delimiter = delimiter
+        self.ext = os.path.splitext(path)[1].lower()
+        if self.ext not in [".csv", ".txt", ".parquet"]:
+            raise ValueError(f"Streaming supports CSV, TXT and Parquet outputs, not '{self.ext}'.")
+        self.rows_written = 0
+        self._columns = None
+        self._empty = None
+        self._parquet_writer = None
+
+    def write(self, chunk):
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+        elif list(chunk.columns) != self._columns:
+            chunk = chunk.reindex(columns=self._columns)
+        if self.ext == ".parquet":
+            self._write_parquet(chunk)
+        else:
+            first = self.rows_written == 0 and self._empty is None
+            chunk.to_csv(self.path, sep=self.delimiter, index=False, mode="w" if first else "a", header=first)
+            if chunk.empty:
+                self._empty = chunk
+        self.rows_written += len(chunk)
+
+    def _write_parquet(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if chunk.empty and self._parquet_writer is None:
+            # Types of an empty object column are unknown; wait for real rows to fix the schema.
+            self._empty = chunk
+            return
+        if self._parquet_writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=self._parquet_writer.schema, preserve_index=False)
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        elif self.ext == ".parquet" and self._empty is not None:
+            self._empty.to_parquet(self.path, index=False, engine="pyarrow")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class _SpillFile:
+    """
+    Collects the chunks that reach a barrier in a temporary Arrow IPC file, so streaming
+    holds one chunk at a time, and reads them back as one frame (row labels included).
+    Raises BarrierInputTooLarge as soon as the spilled data passes max_bytes.
+    """
+    def __init__(self, step_name, max_bytes=None, spill_dir=None):
+        self.step_name = step_name
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._empty = None
+        self._writer = None
+        self._schema = None
+        fd, self.path = tempfile.mkstemp(suffix=".arrow", prefix="barrier_", dir=spill_dir)
+        self._sink = os.fdopen(fd, "wb")
+
+    def write(self, chunk):
+        import pyarrow as pa
+        if chunk.empty and self._writer is None:
+            # An empty object column has no Arrow type yet; wait for real rows to fix the schema.
+            self._empty = chunk
+            return
+        table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=True)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pa.ipc.new_file(self._sink, self._schema)
+        self._writer.write_table(table)
+        self.nbytes += table.nbytes
+        if self.max_bytes is not None and self.nbytes > self.max_bytes:
+            raise BarrierInputTooLarge(
+                f"'{self.step_name}' needs every row that reaches it in memory at once: over "
+                f"{self.nbytes / 1e6:.1f} MB so far, above the {self.max_bytes / 1e6:.1f} MB limit. "
+                "Filter or drop columns before it, or raise max_barrier_bytes.")
+
+    def read(self):
+        import pyarrow as pa
+        if self._writer is None:
+            return self._empty if self._empty is not None else pd.DataFrame()
+        self._writer.close()
+        self._writer = None
+        self._sink.close()
+        with pa.OSFile(self.path, "rb") as source:
+            table = pa.ipc.open_file(source).read_all()
+        # self_destruct frees each Arrow column as it is converted, so the data is not held twice.
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._sink.close()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning("Could not remove spill file %s: %s", self.path, e)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# -------------------- Execution --------------------
+def _count(totals, key, sequence, initial_count, new_count):
+    entry = totals.setdefault((key, sequence), [0, 0])
+    entry[0] += initial_count
+    entry[1] += new_count
+
+def _totals_to_summary(totals):
+    return [{"transformation": key, "sequence": sequence, "initial_count": counts[0], "new_count": counts[1]}
+            for (key, sequence), counts in totals.items()]
+
+def _run_streamed_steps(chunk, filters, plan, transformations, totals, offsets):
+    """Runs filters and the streamed plan on one chunk, accumulating row counts into totals."""
+    initial_count = len(chunk)
+    chunk = apply_filters(chunk, filters)
+    _count(totals, "Filters", 1, initial_count, len(chunk))
+    for i, node in enumerate(plan):
+        initial_count = len(chunk)
+        chunk = execute_transformation_plan(chunk, [node], transformations)
+        _, key, info = node["steps"][0]
+        if (node["op"] == "step" and key == "Generate Unique IDs"
+                and info.get("method", "sequence").strip().lower() == "sequence"):
+            # Numbering restarts at 1 in every chunk; shift it by the rows this step has already seen.
+            new_col = info.get("new_column", "").strip()
+            if new_col in chunk.columns:
+                chunk[new_col] += offsets.get(i, 0)
+            offsets[i] = offsets.get(i, 0) + initial_count
+        for sequence, step_key, _ in node["steps"]:
+            _count(totals, step_key, sequence, initial_count, len(chunk))
+    return chunk
+
+def run_streaming_pipeline(input_path, output_path, config, chunk_rows=DEFAULT_CHUNK_ROWS, header=0,
+                           delimiter=",", column_ids=False, max_barrier_bytes=_UNSET_LIMIT, spill_dir=None):
+    """
+    Runs a pipeline config from input_path to output_path without loading the whole input.
+    Filters and the leading row-local steps run chunk by chunk. If the pipeline has a barrier
+    (a step that needs every row, Advanced Excel Functions, or a join/union), the streamed
+    chunks are spilled to a temporary Arrow file in spill_dir (the system temp directory by
+    default) and read back once, and the rest of the pipeline runs in memory on the filtered
+    and projected data; otherwise each chunk is written straight out. Sort, Group & Aggregate,
+    Remove Duplicates and the like still need every row that reaches them in memory at once,
+    so once the spilled data passes max_barrier_bytes (default: half the physical memory,
+    None for no limit) the run stops with BarrierInputTooLarge instead of exhausting memory.
+    With column_ids=True the source columns are renamed to col_1..col_n (as the GUI does)
+    and mapped back to their names (or 'Rename Columns' internal names) on output, and
+    only the columns the config needs are read (see required_source_columns).
+    Returns the summary with row counts summed over all chunks.
+    """
+    transformations = config.get("Transformations", {})
+    filters = config.get("Filters", [])
+    advanced = config.get("Advanced Excel Functions", {})
+    for problem in validate_transformation_config(transformations):
+        logger.warning("%s. Skipping.", problem)
+    streamed, in_memory = split_streaming_pipeline(config)
+    needs_second_pass = bool(in_memory or advanced
+                             or "Join Dataframes" in transformations or "Union Dataframes" in transformations)
+    plan = compile_transformation_plan({key: info for _, key, info in streamed})
+    registry = {}
+    positions = None
+    if column_ids:
+        names = source_column_names(input_path, header, delimiter)
+        positions = required_source_columns(config, len(names))
+        if len(positions) == len(names):
+            positions = None
+        else:
+            logger.info("Reading %d of %d columns", len(positions), len(names))
+
+    def read_chunks():
+        for chunk in iter_source_chunks(input_path, chunk_rows, header, delimiter, filters, column_ids, positions):
+            if column_ids:
+                if not registry:
+                    registry.update(column_registry_for(chunk.columns, transformations, positions))
+                chunk.columns = list(registry)
+            yield chunk
+
+    def finish(df):
+        df = apply_rename_columns(df, transformations)
+        if column_ids:
+            df.columns = [registry.get(col, col) for col in df.columns]
+        return df
+
+    totals = OrderedDict()
+    offsets = {}
+    if not needs_second_pass:
+        logger.info("Streaming all %d steps in chunks of %d rows", len(streamed), chunk_rows)
+        with ChunkedFileWriter(output_path, delimiter) as writer:
+            for chunk in read_chunks():
+                writer.write(finish(_run_streamed_steps(chunk, filters, plan, transformations, totals, offsets)))
+        return _totals_to_summary(totals)
+
+    logger.info("Streaming %d steps, then %d steps in memory from '%s'",
+                len(streamed), len(in_memory), in_memory[0][1] if in_memory else "end of pipeline")
+    if max_barrier_bytes is _UNSET_LIMIT:
+        max_barrier_bytes = _default_barrier_limit()
+    barrier = in_memory[0][1] if in_memory else "Advanced Excel Functions / join / union"
+    with _SpillFile(barrier, max_barrier_bytes, spill_dir) as spill:
+        for chunk in read_chunks():
+            spill.write(_run_streamed_steps(chunk, filters, plan, transformations, totals, offsets))
+        df = spill.read()
+    summary = _totals_to_summary(totals)
+    df = execute_transformation_plan(
+        df, compile_transformation_plan({key: info for _, key, info in in_memory}), transformations, summary)
+    df = apply_rename_columns(df, transformations)
+    df = apply_advanced_excel_transformations(df, advanced)
+    df, errors = apply_join_and_union(df, transformations, summary)
+    for title, message in errors:
+        logger.error("%s: %s", title, message)
+    if column_ids:
+        df.columns = [registry.get(col, col) for col in df.columns]
+    with ChunkedFileWriter(output_path, delimiter) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            writer.write(df.iloc[start:start + chunk_rows])
+    return summary
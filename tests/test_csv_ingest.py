@@ -0,0 +1,29 @@
+"""
+read_csv_fast must return the same frame as pd.read_csv, whether Arrow parses the file or
+it falls back to pandas.
+"""
+import pandas as pd
+import pytest
+
+from csv_ingest import read_csv_fast
+
+CASES = {
+    "plain": "a,b,c\n1,x,1.5\n2,,2.5\n3,z,\n",
+    "pandas_na_tokens": "a,b\n1,NA\n2,null\nnan,n/a\n",
+    "nan_spelling_not_in_na_list": "a,b\nNAN,1\n2.5,2\n",
+    "mixed_case_nan": "a\nNan\n1.5\n",
+    "plus_signed_ints": "a,b\n+5,1\n-3,2\n7,3\n",
+    "plus_signed_zero": "a\n+0\n2\n",
+    "plus_in_text_and_exponent": "a,b\n1e+5,+1 555\n2.5,x\n",
+    "hex": "a\n0x1F\n2\n",
+    "uint64": "a\n18446744073709551615\n1\n",
+    "below_int64": "a\n-9223372036854775809\n1\n",
+    "int64_min": "a\n-9223372036854775808\n1\n",
+    "infinity": "a\ninf\n-Infinity\n1.5\n",
+}
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_matches_pandas(tmp_path, name):
+    path = tmp_path / f"{name}.csv"
+    path.write_text(CASES[name])
+    pd.testing.assert_frame_equal(read_csv_fast(str(path)), pd.read_csv(str(path)))
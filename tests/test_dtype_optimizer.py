@@ -0,0 +1,37 @@
+"""
+Tests for dtype_optimizer on frames loaded the way the app loads them.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from csv_ingest import read_csv_fast
+from dtype_optimizer import optimize_dtypes, apply_dtype_plan
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5_000
+    path = tmp_path / "regions.csv"
+    pd.DataFrame({
+        "region": rng.choice(["north", "south", "east", "west"], n),
+        "order_id": [f"ORD-{i:06d}" for i in range(n)],
+        "amount": rng.random(n),
+    }).to_csv(path, index=False)
+    return str(path)
+
+@pytest.mark.parametrize("reader", [pd.read_csv, read_csv_fast])
+def test_loaded_text_columns_shrink(csv_path, reader):
+    df = reader(csv_path)
+    optimized, plan, (before, after) = optimize_dtypes(df)
+    assert plan == {"region": "category"}
+    assert after < before
+    assert optimized["region"].astype(str).tolist() == df["region"].tolist()
+    assert apply_dtype_plan(reader(csv_path), plan).dtypes.equals(optimized.dtypes)
+
+def test_object_text_becomes_arrow_strings(csv_path):
+    df = pd.read_csv(csv_path).astype({"region": object, "order_id": object})
+    optimized, plan, (before, after) = optimize_dtypes(df, text_dtype="string[pyarrow]")
+    assert plan == {"region": "string[pyarrow]", "order_id": "string[pyarrow]"}
+    assert after < before
@@ -0,0 +1,39 @@
+"""
+Filtered CSV reads must type every column exactly as an unfiltered read does.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from csv_ingest import read_csv_fast
+from predicate_pushdown import read_csv_filtered
+from transformations import compile_filter_mask
+
+FILTERS = [{"group_logic": "AND", "conditions": [
+    {"col": "col_1", "cond": "Greater Than", "value": "100"},
+    {"col": "col_2", "cond": "Not Null", "value": None, "row_logic": "AND"},
+]}]
+
+@pytest.fixture(params=["arrow", "pandas_fallback"])
+def csv_path(tmp_path, request):
+    n = 3_000
+    df = pd.DataFrame({"id": np.arange(n, dtype=float), "label": ["x"] * n, "amount": np.arange(n) * 1.5})
+    df.loc[df.index % 7 == 0, "label"] = None
+    # A gap late in the file turns the whole id column into float in a single full read.
+    df.loc[n - 10, "id"] = np.nan
+    if request.param == "pandas_fallback":
+        df.loc[5, "label"] = "0x1F"
+    path = tmp_path / "orders.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+def _expected(path, usecols=None):
+    full = read_csv_fast(path)
+    view = full.set_axis([f"col_{i+1}" for i in range(full.shape[1])], axis=1)
+    expected = full.loc[compile_filter_mask(view, FILTERS)]
+    return expected if usecols is None else expected.iloc[:, usecols]
+
+@pytest.mark.parametrize("usecols", [None, [0, 1]])
+def test_filtered_read_matches_full_read(csv_path, usecols):
+    got = read_csv_filtered(csv_path, FILTERS, column_ids=True, usecols=usecols)
+    pd.testing.assert_frame_equal(got, _expected(csv_path, usecols))
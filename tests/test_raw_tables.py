@@ -0,0 +1,34 @@
+"""
+Set Header on CSV/TXT sources: the file is read once, later header rows come from memory.
+"""
+import pandas as pd
+import pytest
+
+import raw_tables
+
+# The second body goes through the pandas fallback ("0x" in the file), the first through Arrow.
+BODIES = ["Report,,\nGenerated today,,\nid,name,amount\n1,a,1.5\n2,b,\n3,c,2\n",
+          "Report,,\nGenerated today,,\nid,name,amount\n1,a,1.5\n2,b,\n3,0x1,2\n"]
+
+@pytest.fixture(params=range(len(BODIES)))
+def messy_csv(tmp_path, request):
+    path = tmp_path / "messy.csv"
+    path.write_text(BODIES[request.param])
+    raw_tables.clear_raw_cache()
+    yield str(path)
+    raw_tables.clear_raw_cache()
+
+def test_new_header_rows_do_not_reread_the_file(messy_csv, monkeypatch):
+    reads = []
+    read_bytes = raw_tables._read_bytes
+    monkeypatch.setattr(raw_tables, "_read_bytes", lambda path: reads.append(path) or read_bytes(path))
+    for header in (0, 2, 1):
+        df = raw_tables.read_with_header(messy_csv, header)
+        pd.testing.assert_frame_equal(df, pd.read_csv(messy_csv, header=header))
+    assert reads == [messy_csv]
+
+def test_changed_file_is_read_again(messy_csv):
+    raw_tables.read_with_header(messy_csv, 2)
+    with open(messy_csv, "a") as f:
+        f.write("4,d,2.5\n")
+    assert len(raw_tables.read_with_header(messy_csv, 2)) == 4
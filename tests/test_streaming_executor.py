@@ -0,0 +1,44 @@
+"""
+Streaming runs with a barrier step: chunks are spilled to disk and read back once.
+"""
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_executor import run_streaming_pipeline, BarrierInputTooLarge
+from transformations import apply_transformations_with_summary
+
+CONFIG = {"Filters": [], "Transformations": {
+    "Trim": {"columns": {"label": {"operations": ["Trim Spaces"]}}, "sequence": 1},
+    "Sort Data": {"columns": ["key", "amount"], "sequence": 2},
+}}
+
+@pytest.fixture
+def source(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5_000
+    path = tmp_path / "source.csv"
+    pd.DataFrame({"key": rng.integers(0, 50, n), "label": rng.choice([" a ", "b", None], n),
+                  "amount": rng.random(n)}).to_csv(path, index=False)
+    return str(path)
+
+@pytest.mark.parametrize("out_name", ["out.csv", "out.parquet"])
+def test_barrier_after_spill_matches_in_memory_run(source, tmp_path, out_name):
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    out = str(tmp_path / out_name)
+    run_streaming_pipeline(source, out, CONFIG, chunk_rows=700, spill_dir=str(spill_dir))
+    expected, _ = apply_transformations_with_summary(pd.read_csv(source), CONFIG)
+    got = pd.read_csv(out) if out.endswith(".csv") else pd.read_parquet(out)
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False)
+    assert os.listdir(spill_dir) == []
+
+def test_barrier_input_over_the_limit_is_rejected(source, tmp_path):
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    with pytest.raises(BarrierInputTooLarge, match="Sort Data"):
+        run_streaming_pipeline(source, str(tmp_path / "out.csv"), CONFIG, chunk_rows=700,
+                               max_barrier_bytes=20_000, spill_dir=str(spill_dir))
+    assert os.listdir(spill_dir) == []
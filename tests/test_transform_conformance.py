@@ -0,0 +1,38 @@
+"""
+Pytest entry point for benchmarks/transform_conformance.py at the smallest size.
+
+Every registered step runs through apply_transformation_step on a 1e3-row synthetic frame and
+must neither raise nor log an error. Timing and memory baselines stay in the script
+(--baseline); they are machine specific and do not belong in a pass/fail test.
+"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import transform_conformance as conformance  # noqa: E402
+import transformations  # noqa: E402
+
+SIZE = 1_000
+
+@pytest.fixture(scope="module")
+def frame():
+    return conformance.synthetic_frame(SIZE)
+
+def test_no_duplicate_definitions():
+    root = conformance.REPO_ROOT
+    sources = [os.path.join(root, name) for name in sorted(os.listdir(root)) if name.endswith(".py")]
+    assert conformance.duplicate_definitions(sources) == []
+
+def test_every_registered_step_has_a_case():
+    missing = sorted(name for name, func in transformations.TRANSFORMATION_REGISTRY.items()
+                     if name not in conformance.CASES
+                     and not any(transformations.TRANSFORMATION_REGISTRY.get(case) is func for case in conformance.CASES))
+    assert missing == []
+
+@pytest.mark.parametrize("name", sorted(conformance.CASES))
+def test_step_runs_cleanly(name, frame):
+    run = conformance.run_step(name, frame, repeat=1)
+    assert run["status"] == "ok", run["problems"]
+    assert run["rows_out"] >= 0
@@ -0,0 +1,43 @@
+"""
+Regression tests for the transformation pipeline entry points.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import transformations
+
+
+def _derive_then_drop():
+    return {
+        "Filters": [],
+        "Transformations": {
+            "LEN": {"column": "a", "new_column": "a_len", "sequence": 1},
+            "Drop Columns": {"columns_to_drop": ["a"], "registry": {"a": "a"}, "sequence": 2},
+        },
+    }
+
+@pytest.mark.parametrize("optimize", [True, False])
+def test_drop_a_column_consumed_by_an_earlier_step(optimize):
+    df = pd.DataFrame({"a": ["x", "yy", "zzz"], "b": [1, 2, 3]})
+    out, summary = transformations.apply_transformations_with_summary(df, _derive_then_drop(), optimize=optimize)
+    assert list(out.columns) == ["b", "a_len"]
+    assert out["a_len"].tolist() == [1, 2, 3]
+    assert [step["transformation"] for step in summary] == ["Filters", "LEN", "Drop Columns"]
+
+def test_group_aggregate_percentiles():
+    df = pd.DataFrame({"g": ["a"] * 100, "v": np.arange(100, dtype=float)})
+    info = {"group_columns": ["g"], "aggregations": {"v": ["p1", "p90", "percentile_1", "quantile_0.9"]}}
+    out = transformations.apply_transform_group_aggregate(df, info)
+    assert out.loc[0, "v_p1"] == pytest.approx(0.99)
+    assert out.loc[0, "v_percentile_1"] == pytest.approx(0.99)
+    assert out.loc[0, "v_p90"] == pytest.approx(89.1)
+    assert out.loc[0, "v_quantile_0.9"] == pytest.approx(89.1)
+
+@pytest.mark.parametrize("func", ["p150", "quantile_2"])
+def test_group_aggregate_rejects_out_of_range_quantiles(func, caplog):
+    df = pd.DataFrame({"g": ["a", "a", "b"], "v": [1.0, 2.0, 3.0]})
+    info = {"group_columns": ["g"], "aggregations": {"v": [func, "sum"]}}
+    out = transformations.apply_transform_group_aggregate(df, info)
+    assert list(out.columns) == ["g", "v_sum"]
+    assert any(func in record.getMessage() and record.levelname == "ERROR" for record in caplog.records)
@@ -10,11 +10,29 @@
 from PyQt6.QtCore import Qt 
 from PyQt6.QtWidgets import (
     QFormLayout,QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QAbstractItemView,
-    QSpinBox, QLayout, QListWidget, QListWidgetItem, QPushButton, QHeaderView, QTableWidget,QTableWidgetItem
+    QSpinBox, QLayout, QListWidget, QListWidgetItem, QPushButton, QHeaderView, QTableWidget,QTableWidgetItem, QCheckBox
 )
 from ui_helpers import add_ok_cancel_buttons, create_combo_box, single_friendly_to_internal, internal_to_friendly
 from ui_dialogs_data_cleaning import SearchableColumnListDialog
 from help_system import get_help_section, HelpDialog
+from window_functions import WINDOW_FUNCTIONS
+
+def parse_param_text(param_text):
+    """Parses comma-separated key:value pairs, converting numeric values to int or float."""
+    params = {}
+    for part in (p.strip() for p in param_text.split(",")):
+        if ":" not in part:
+            continue
+        key, value = (s.strip() for s in part.split(":", 1))
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        params[key] = value
+    return params
+
 # -------------------- Generate Unique IDs Dialog --------------------
 
 class GenerateUniqueIDsDialog(QDialog):
@@ -206,68 +224,6 @@ class ConvertDatatypeDialog(QDialog):
                 }
         self.selected_columns = column_mappings  # Persist selections
         return {"columns": column_mappings}
-# -------------------- Generic Transformation Dialog --------------------
-class GenericTransformationDialog(QDialog):
-    def __init__(self, friendly_columns, registry, init_params=None, param_defs=None,
-                 dialog_title="Configure Transformation", multi_col_label="Select Column:", parent=None):
-        super().__init__(parent)
-        self.setWindowTitle(dialog_title + " ⚙️")
-        self.friendly_columns = friendly_columns
-        self.registry = registry
-        self.init_params = init_params or {}
-        self.param_defs = param_defs or []
-        self._widgets = {}
-        self.initUI(multi_col_label)
-    
-    def initUI(self, multi_col_label):
-        layout = QVBoxLayout(self)
-        layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
-        # Transformation order (optional)
-        layout.addWidget(QLabel("Transformation Order (optional, integer):"))
-        self.order_edit = QLineEdit()
-        self.order_edit.setPlaceholderText("e.g., 100")
-        if "order" in self.init_params:
-            self.order_edit.setText(str(self.init_params["order"]))
-        layout.addWidget(self.order_edit)
-        # Column selection with drop-down (searchable)
-        if self.friendly_columns:
-            layout.addWidget(QLabel(multi_col_label))
-            self.col_combo = create_combo_box(self.friendly_columns, editable=True)
-            if "column" in self.init_params:
-                friendly = internal_to_friendly(self.init_params["column"], self.registry)
-                if friendly in self.friendly_columns:
-                    self.col_combo.setCurrentText(friendly)
-            layout.addWidget(self.col_combo)
-        for pdef in self.param_defs:
-            layout.addWidget(QLabel(pdef["label"]))
-            if pdef["type"] == "int":
-                widget = QSpinBox()
-                widget.setRange(-999999, 999999)
-                widget.setValue(int(self.init_params.get(pdef["name"], 0)))
-            else:
-                widget = QLineEdit(str(self.init_params.get(pdef["name"], "")))
-            layout.addWidget(widget)
-            self._widgets[pdef["name"]] = widget
-        add_ok_cancel_buttons(self, layout)
-        self.setLayout(layout)
-        self.adjustSize()
-    
-    def getValues(self):
-        values = {}
-        order_text = self.order_edit.text().strip()
-        if order_text.isdigit():
-            values["order"] = int(order_text)
-        if self.friendly_columns:
-            friendly = self.col_combo.currentText()
-            col_id = single_friendly_to_internal(friendly, self.registry)
-            if col_id:
-                values["column"] = col_id
-        for pdef in self.param_defs:
-            if pdef["type"] == "int":
-                values[pdef["name"]] = self._widgets[pdef["name"]].value()
-            else:
-                values[pdef["name"]] = self._widgets[pdef["name"]].text().strip()
-        return values
 # -------------------- New Dialogs for Aggregations & Analytical Functions --------------------
 class GroupAggregateDialog(QDialog):
     def __init__(self, friendly_columns, registry, init_params=None, parent=None):
@@ -342,9 +298,10 @@ class GroupAggregateDialog(QDialog):
         # Target Column: searchable drop-down
         target_cb = create_combo_box(self.friendly_columns, editable=True)
         self.table.setCellWidget(row, 0, target_cb)
-        # Aggregation Function drop-down – include common functions and "count_distinct"
+        # Aggregation Function drop-down – common functions, count_distinct, quantiles (p90, p25, ...) and first/last
         agg_cb = QComboBox()
-        agg_cb.addItems(["sum", "mean", "max", "min", "count", "count_distinct", "median", "std", "var"])
+        agg_cb.addItems(["sum", "mean", "max", "min", "count", "count_distinct", "approx_count_distinct",
+                         "median", "p90", "std", "var", "first", "last"])
         self.table.setCellWidget(row, 1, agg_cb)
         # New Column Name: free text (optional)
         newcol_edit = QLineEdit()
@@ -377,36 +334,6 @@ class GroupAggregateDialog(QDialog):
                     self.table.cellWidget(row, 2).setText(new_names[key])
                 if key in having:
                     self.table.cellWidget(row, 3).setText(having[key])
-    def getValues(self):
-            values = {}
-            values["group_columns"] = self.selected_group_cols
-            aggregations = {}
-            new_names = {}
-            having = {}
-            for row in range(self.table.rowCount()):
-                friendly_target = self.table.cellWidget(row, 0).currentText().strip()
-                target = single_friendly_to_internal(friendly_target, self.registry)
-                agg = self.table.cellWidget(row, 1).currentText().strip()
-                newcol = self.table.cellWidget(row, 2).text().strip()
-                having_condition = self.table.cellWidget(row, 3).text().strip()
-                if target in aggregations:
-                    if isinstance(aggregations[target], list):
-                        aggregations[target].append(agg)
-                    else:
-                        aggregations[target] = [aggregations[target], agg]
-                else:
-                    aggregations[target] = agg
-                if newcol:
-                    new_names[(target, agg)] = newcol
-                if having_condition:
-                    alias = new_names.get((target, agg), f"{target}_{agg}")
-                    having[alias] = having_condition
-            values["aggregations"] = aggregations
-            if new_names:
-                values["new_names"] = new_names
-            if having:
-                values["having"] = having
-            return values
     
     def getValues(self):
         values = {}
@@ -624,21 +551,7 @@ class AnalyticalFunctionsDialog(QDialog):
             func = self.table.cellWidget(row, 1).currentText().strip()
             param_text = self.table.cellWidget(row, 2).text().strip()
             newcol = self.table.cellWidget(row, 3).text().strip()
-            params = {}
-            if param_text:
-                # Parse parameters entered as comma-separated key:value pairs.
-                parts = [p.strip() for p in param_text.split(",") if p.strip()]
-                for part in parts:
-                    if ":" in part:
-                        key, value = part.split(":", 1)
-                        key = key.strip()
-                        value = value.strip()
-                        # Try to convert numeric parameters to int if possible.
-                        try:
-                            value = int(value)
-                        except ValueError:
-                            pass
-                        params[key] = value
+            params = parse_param_text(param_text)
             if newcol:
                 params["new_column"] = newcol
             if target not in analytical:
@@ -647,6 +560,115 @@ class AnalyticalFunctionsDialog(QDialog):
         values["analytical"] = analytical
         return values
 
+# -------------------- Window Functions Dialog --------------------
+class WindowFunctionsDialog(QDialog):
+    def __init__(self, friendly_columns, registry, init_params=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Configure Window Functions")
+        self.friendly_columns = friendly_columns
+        self.registry = registry
+        self.init_params = init_params or {}
+        self.partition_cols = list(self.init_params.get("partition_by", []))
+        self.order_cols = list(self.init_params.get("order_by", []))
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
+
+        # PARTITION BY and ORDER BY column selection, shared by every function of the step
+        self.partition_display = self._addColumnPicker(layout, "Partition By:", "partition_cols")
+        self.order_display = self._addColumnPicker(layout, "Order By:", "order_cols")
+        self.descending_check = QCheckBox("Descending order")
+        self.descending_check.setChecked(self.init_params.get("ascending", True) is False)
+        layout.addWidget(self.descending_check)
+
+        # Table for functions (4 columns: Function, Column, Parameters, New Column)
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Function", "Column", "Parameters", "New Column Name"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        self.btn_add = QPushButton("Add Function")
+        self.btn_add.clicked.connect(self.addRow)
+        btn_layout.addWidget(self.btn_add)
+        self.btn_remove = QPushButton("Remove Selected Function")
+        self.btn_remove.clicked.connect(self.removeRow)
+        btn_layout.addWidget(self.btn_remove)
+        layout.addLayout(btn_layout)
+
+        add_ok_cancel_buttons(self, layout)
+        self.setLayout(layout)
+        self.adjustSize()
+
+        for spec in self.init_params.get("functions", []):
+            self.addRow(spec)
+
+    def _addColumnPicker(self, layout, label, attr):
+        row_layout = QHBoxLayout()
+        row_layout.addWidget(QLabel(label))
+        display = QLineEdit()
+        display.setReadOnly(True)
+        display.setText(", ".join(internal_to_friendly(col, self.registry) for col in getattr(self, attr)))
+        row_layout.addWidget(display)
+        btn_select = QPushButton("Select...")
+        btn_select.clicked.connect(lambda: self._selectColumns(attr, display))
+        row_layout.addWidget(btn_select)
+        layout.addLayout(row_layout)
+        return display
+
+    def _selectColumns(self, attr, display):
+        dlg = SearchableColumnListDialog(self.friendly_columns, title="Select Columns", multi_select=True, parent=self)
+        if dlg.exec() == QDialog.DialogCode.Accepted:
+            selected = [single_friendly_to_internal(col, self.registry) for col in dlg.getSelectedColumns()]
+            setattr(self, attr, selected)
+            display.setText(", ".join(internal_to_friendly(col, self.registry) for col in selected))
+
+    def addRow(self, spec=None):
+        spec = spec if isinstance(spec, dict) else {}
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        func_cb = QComboBox()
+        func_cb.addItems(WINDOW_FUNCTIONS)
+        if spec.get("function"):
+            func_cb.setCurrentText(spec["function"])
+        self.table.setCellWidget(row, 0, func_cb)
+        # Column: ranking functions (row_number, rank, ntile, ...) leave it empty
+        column_cb = create_combo_box([""] + list(self.friendly_columns), editable=True)
+        if spec.get("column"):
+            column_cb.setCurrentText(internal_to_friendly(spec["column"], self.registry))
+        self.table.setCellWidget(row, 1, column_cb)
+        param_edit = QLineEdit()
+        param_edit.setPlaceholderText("e.g., frame:rows, preceding:2, following:0; frame:range, preceding:7D; "
+                                      "offset:1, default:0; n:2; buckets:4")
+        param_edit.setText(", ".join(f"{k}:{v}" for k, v in spec.items() if k not in ("function", "column", "new_column")))
+        self.table.setCellWidget(row, 2, param_edit)
+        newcol_edit = QLineEdit(spec.get("new_column", ""))
+        self.table.setCellWidget(row, 3, newcol_edit)
+
+    def removeRow(self):
+        selected = self.table.selectedRanges()
+        if selected:
+            self.table.removeRow(selected[0].topRow())
+
+    def getValues(self):
+        values = {"partition_by": self.partition_cols, "order_by": self.order_cols,
+                  "ascending": not self.descending_check.isChecked()}
+        functions = []
+        for row in range(self.table.rowCount()):
+            spec = {"function": self.table.cellWidget(row, 0).currentText().strip()}
+            friendly_column = self.table.cellWidget(row, 1).currentText().strip()
+            if friendly_column:
+                spec["column"] = single_friendly_to_internal(friendly_column, self.registry)
+            spec.update(parse_param_text(self.table.cellWidget(row, 2).text()))
+            newcol = self.table.cellWidget(row, 3).text().strip()
+            if newcol:
+                spec["new_column"] = newcol
+            functions.append(spec)
+        values["functions"] = functions
+        return values
+
 class NormalizeDataDialog(QDialog):
     def __init__(self, friendly_columns, registry, init_params=None, parent=None):
         super().__init__(parent)
@@ -8,6 +8,8 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 import sys
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from PyQt6.QtWidgets import QPushButton, QComboBox, QGroupBox, QHBoxLayout, QVBoxLayout, QLayout
 from PyQt6.QtCore import QAbstractTableModel, QVariant, Qt
@@ -48,9 +50,20 @@ def create_config_group(title, bg_color, border_color):
 
 # PandasModel for DataFrame display
 class PandasModel(QAbstractTableModel):
-    def __init__(self, df=pd.DataFrame(), parent=None):
+    """
+    Read-only table model over a DataFrame. The frame is held by reference (never copied),
+    so callers must not mutate it while it is displayed. Cells are read through cached
+    per-column arrays and formatted lazily in blocks of BLOCK_ROWS rows; only the most
+    recently painted MAX_BLOCKS blocks are kept as strings.
+    """
+    BLOCK_ROWS = 256
+    MAX_BLOCKS = 512
+
+    def __init__(self, df=None, parent=None):
         super().__init__(parent)
-        self._df = df
+        self._df = pd.DataFrame() if df is None else df
+        self._columns = {}
+        self._blocks = OrderedDict()
 
     def rowCount(self, parent=None):
         return len(self._df.index)
@@ -58,27 +71,81 @@ class PandasModel(QAbstractTableModel):
     def columnCount(self, parent=None):
         return len(self._df.columns)
 
+    def _column_values(self, col):
+        values = self._columns.get(col)
+        if values is None:
+            series = self._df.iloc[:, col]
+            # Plain NumPy columns are read without a copy; datetimes and extension types keep
+            # their pandas array so cells still format as Timestamp/NA like iloc would.
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind not in "mM":
+                values = series.to_numpy()
+            else:
+                values = series.array
+            self._columns[col] = values
+        return values
+
+    def _block(self, col, block):
+        key = (col, block)
+        texts = self._blocks.get(key)
+        if texts is not None:
+            self._blocks.move_to_end(key)
+            return texts
+        start = block * self.BLOCK_ROWS
+        texts = [str(v) for v in self._column_values(col)[start:start + self.BLOCK_ROWS]]
+        self._blocks[key] = texts
+        if len(self._blocks) > self.MAX_BLOCKS:
+            self._blocks.popitem(last=False)
+        return texts
+
+    def cellText(self, row, col):
+        return self._block(col, row // self.BLOCK_ROWS)[row % self.BLOCK_ROWS]
+
+    def sampleTexts(self, col, rows):
+        """Text of the given rows of one column, formatted directly without touching the block cache."""
+        values = self._column_values(col)
+        return [str(values[row]) for row in rows]
+
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if not index.isValid():
             return QVariant()
         if role == Qt.ItemDataRole.DisplayRole:
-            return str(self._df.iloc[index.row(), index.column()])
+            return self.cellText(index.row(), index.column())
         return QVariant()
 
     def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
         if role == Qt.ItemDataRole.DisplayRole:
-            return (self._df.columns[section] if orientation == Qt.Orientation.Horizontal
+            return (str(self._df.columns[section]) if orientation == Qt.Orientation.Horizontal
                     else str(self._df.index[section]))
         return QVariant()
 
     def setDataFrame(self, df):
         self.beginResetModel()
-        self._df = df.copy()
+        self._df = df
+        self._columns.clear()
+        self._blocks.clear()
         self.endResetModel()
 
     def getDataFrame(self):
         return self._df.copy()
 
+def resize_columns_from_sample(table_view, sample_rows=100, max_width=400, padding=24):
+    """
+    Sizes each column of a PandasModel view from its header and an evenly spaced sample of
+    rows, instead of ResizeToContents which measures every row on each reset.
+    """
+    model = table_view.model()
+    header = table_view.horizontalHeader()
+    cell_metrics = table_view.fontMetrics()
+    header_metrics = header.fontMetrics()
+    n_rows = model.rowCount()
+    step = max(1, n_rows // sample_rows)
+    rows = range(0, n_rows, step)[:sample_rows]
+    for col in range(model.columnCount()):
+        width = header_metrics.horizontalAdvance(str(model.headerData(col, Qt.Orientation.Horizontal)))
+        for text in model.sampleTexts(col, rows):
+            width = max(width, cell_metrics.horizontalAdvance(text))
+        header.resizeSection(col, min(width + padding, max_width))
+
 # Column Registry Helper Functions
 def friendly_to_internal(col_names, registry):
     return [k for col in col_names for k, v in registry.items() if v == col]
@@ -0,0 +1,256 @@
+"""
+SQL-style window functions for the "Window Functions" step.
+
+Every function of a step shares one PARTITION BY / ORDER BY pass: the rows are sorted once
+by (partition, order keys), the partition and peer boundaries are computed once as
+per-row position arrays, and each function is then a vectorized pass over those arrays
+whose result is scattered back to the original row order.
+
+Step config:
+    partition_by  column ids (none: the whole frame is one partition)
+    order_by      column ids; ascending is a bool or one bool per order_by column
+    functions     list of {"function", "column", "new_column", ...} where the extra keys are
+                  offset, default      lag / lead (offset defaults to 1, default to NaN)
+                  n                    nth_value
+                  buckets              ntile
+                  frame                "rows" or "range", with preceding / following given as
+                                       a row count or range offset (a number, or a Timedelta
+                                       string such as "7D" over datetime keys), 0 for the
+                                       current row, or "unbounded"
+
+Functions without a frame use the SQL default: RANGE UNBOUNDED PRECEDING to CURRENT ROW when
+there is an ORDER BY, otherwise the whole partition. Ranking functions rank by the ORDER BY
+keys, so rows with equal keys are peers.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+logger = logging.getLogger(__name__)
+
+RANKING_FUNCTIONS = ["row_number", "rank", "dense_rank", "percent_rank", "cume_dist", "ntile"]
+OFFSET_FUNCTIONS = ["lag", "lead"]
+VALUE_FUNCTIONS = ["first_value", "last_value", "nth_value"]
+FRAME_AGGREGATES = ["sum", "mean", "min", "max", "count", "std", "var", "median"]
+WINDOW_FUNCTIONS = RANKING_FUNCTIONS + OFFSET_FUNCTIONS + VALUE_FUNCTIONS + FRAME_AGGREGATES
+FRAME_TYPES = ["rows", "range"]
+
+class _FrameIndexer(BaseIndexer):
+    """Hands precomputed [start, end) frame bounds to pandas' rolling aggregations."""
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        return self.start, self.end
+
+def _as_list(value):
+    if value is None or value == "":
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def _segment_bounds(is_start):
+    """Per-row [start, end) positions of the segment each row belongs to."""
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], len(is_start))
+    segment = np.cumsum(is_start) - 1
+    return starts[segment], ends[segment]
+
+def _changes(values):
+    """True where a value differs from the previous row's (missing values count as equal)."""
+    previous = values.shift()
+    changed = (values != previous).fillna(True) & ~(values.isna() & previous.isna())
+    # A copy: under copy-on-write to_numpy can hand back a read-only view.
+    changed = changed.to_numpy(dtype=bool, copy=True)
+    if len(changed):
+        changed[0] = True
+    return changed
+
+def _frame_offset(value):
+    """None for an unbounded side, otherwise the offset (0 is the current row)."""
+    if value is None or (isinstance(value, str) and value.strip().lower() in ("", "unbounded")):
+        return None
+    if isinstance(value, str) and value.strip().lower() in ("current", "current row"):
+        return 0
+    return value
+
+class _WindowLayout:
+    """Sort order and partition/peer boundaries shared by every function of one step."""
+
+    def __init__(self, df, partition_by, order_by, ascending=True):
+        n = len(df)
+        if partition_by:
+            codes = df.groupby(partition_by, sort=False, dropna=False).ngroup().to_numpy()
+        else:
+            codes = np.zeros(n, dtype=np.int64)
+        self.ascending = list(ascending) if isinstance(ascending, (list, tuple)) else [bool(ascending)] * len(order_by)
+        if len(self.ascending) != len(order_by):
+            raise ValueError(f"{len(self.ascending)} ascending flags given for {len(order_by)} order_by columns.")
+        if order_by:
+            # Positional labels, so order_by columns cannot collide with the partition codes.
+            keys = pd.concat([pd.Series(codes)] + [df[col].reset_index(drop=True) for col in order_by], axis=1)
+            keys.columns = range(keys.shape[1])
+            self.order = keys.sort_values(list(keys.columns), ascending=[True] + self.ascending,
+                                          kind="stable", na_position="last").index.to_numpy()
+        else:
+            self.order = np.argsort(codes, kind="stable")
+        self.inverse = np.empty_like(self.order)
+        self.inverse[self.order] = np.arange(n)
+        self.codes = codes[self.order]
+        self.row = np.arange(n)
+        partition_flags = np.ones(n, dtype=bool)
+        partition_flags[1:] = self.codes[1:] != self.codes[:-1]
+        self.part_start, self.part_end = _segment_bounds(partition_flags)
+        self.order_keys = [df[col].take(self.order).reset_index(drop=True) for col in order_by]
+        self.peer_flags = partition_flags.copy()
+        for key in self.order_keys:
+            self.peer_flags |= _changes(key)
+        self.peer_start, self.peer_end = _segment_bounds(self.peer_flags)
+
+    def sorted_values(self, column, df):
+        return df[column].take(self.order).reset_index(drop=True)
+
+    def scatter(self, result, index):
+        """Puts a result computed in sorted order back into the original row order."""
+        if not isinstance(result, pd.Series):
+            result = pd.Series(result)
+        return result.take(self.inverse).set_axis(index)
+
+    def _range_key(self, offset):
+        """The order key as an ascending numeric array, the offset in the same units, and the missing-value sentinel."""
+        if len(self.order_keys) != 1:
+            raise ValueError("RANGE frames with an offset need exactly one ORDER BY column.")
+        key = self.order_keys[0]
+        missing = key.isna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(key.dtype):
+            values = pd.DatetimeIndex(key).asi8.copy()
+            offset = pd.Timedelta(offset).value
+            sentinel = np.iinfo(np.int64).max
+        else:
+            values = pd.to_numeric(key).to_numpy(dtype=float, na_value=np.nan, copy=True)
+            offset = float(offset)
+            sentinel = np.inf
+        if not self.ascending[0]:
+            values = -values
+        values[missing] = sentinel
+        return values, offset, missing, sentinel
+
+    def _range_bound(self, offset, side):
+        if offset == 0:
+            return self.peer_start if side == "start" else self.peer_end
+        values, offset, missing, sentinel = self._range_key(offset)
+        target = values - offset if side == "start" else values + offset
+        target[missing] = sentinel
+        # Partitions are contiguous and sorted by key, so one search over (partition, key)
+        # pairs finds every row's bound without looping over partitions.
+        pairs_dtype = np.dtype([("partition", np.int64), ("key", values.dtype)])
+        pairs = np.empty(len(values), dtype=pairs_dtype)
+        pairs["partition"], pairs["key"] = self.codes, values
+        queries = np.empty(len(values), dtype=pairs_dtype)
+        queries["partition"], queries["key"] = self.codes, target
+        return np.searchsorted(pairs, queries, side="left" if side == "start" else "right")
+
+    def frame_bounds(self, spec):
+        """Per-row [start, end) frame positions for a function spec."""
+        frame = str(spec.get("frame") or "").strip().lower()
+        if not frame:
+            return self.part_start, (self.peer_end if self.order_keys else self.part_end)
+        if frame not in FRAME_TYPES:
+            raise ValueError(f"Unknown frame type '{frame}'; expected one of {FRAME_TYPES}.")
+        preceding = _frame_offset(spec.get("preceding", "unbounded"))
+        following = _frame_offset(spec.get("following", 0))
+        if frame == "rows":
+            start = self.part_start if preceding is None else self.row - int(preceding)
+            end = self.part_end if following is None else self.row + int(following) + 1
+        else:
+            start = self.part_start if preceding is None else self._range_bound(preceding, "start")
+            end = self.part_end if following is None else self._range_bound(following, "end")
+        start = np.clip(start, self.part_start, self.part_end).astype(np.int64)
+        end = np.clip(end, start, self.part_end).astype(np.int64)
+        return start, end
+
+def _ranking(layout, function, spec):
+    sizes = layout.part_end - layout.part_start
+    if function == "row_number":
+        return layout.row - layout.part_start + 1
+    rank = layout.peer_start - layout.part_start + 1
+    if function == "rank":
+        return rank
+    if function == "dense_rank":
+        peers_seen = np.cumsum(layout.peer_flags)
+        return peers_seen - peers_seen[layout.part_start] + 1
+    if function == "percent_rank":
+        return np.where(sizes > 1, (rank - 1) / np.maximum(sizes - 1, 1), 0.0)
+    if function == "cume_dist":
+        return (layout.peer_end - layout.part_start) / sizes
+    buckets = int(spec.get("buckets", 4))
+    if buckets < 1:
+        raise ValueError("ntile needs at least one bucket.")
+    # SQL NTILE: the first (size % buckets) buckets get one extra row.
+    position = layout.row - layout.part_start
+    per_bucket, larger = np.divmod(sizes, buckets)
+    in_larger = larger * (per_bucket + 1)
+    return np.where(position < in_larger, position // (per_bucket + 1),
+                    larger + (position - in_larger) // np.maximum(per_bucket, 1)) + 1
+
+def _offset_value(layout, function, values, spec):
+    offset = int(spec.get("offset", 1))
+    target = layout.row - offset if function == "lag" else layout.row + offset
+    valid = (target >= layout.part_start) & (target < layout.part_end)
+    shifted = values.take(np.where(valid, target, layout.row)).reset_index(drop=True)
+    return shifted.where(valid, spec.get("default", np.nan))
+
+def _frame_value(layout, function, values, spec):
+    start, end = layout.frame_bounds(spec)
+    if function == "first_value":
+        position = start
+    elif function == "last_value":
+        position = end - 1
+    else:
+        n = int(spec.get("n", 1))
+        if n < 1:
+            raise ValueError("nth_value needs n >= 1.")
+        position = start + n - 1
+    valid = (position >= start) & (position < end)
+    picked = values.take(np.where(valid, position, layout.row)).reset_index(drop=True)
+    return picked.where(valid)
+
+def _frame_aggregate(layout, function, values, spec):
+    start, end = layout.frame_bounds(spec)
+    indexer = _FrameIndexer(start=start, end=end)
+    return values.rolling(indexer, min_periods=0 if function == "count" else 1).agg(function)
+
+def apply_window_functions(df, info):
+    """Evaluates the step's window functions; each adds (or replaces) one column of df."""
+    partition_by = _as_list(info.get("partition_by"))
+    order_by = _as_list(info.get("order_by"))
+    functions = info.get("functions", [])
+    if not functions:
+        logger.warning("Window Functions: no functions configured.")
+        return df
+    try:
+        layout = _WindowLayout(df, partition_by, order_by, info.get("ascending", True))
+    except Exception as e:
+        logger.error("Window Functions: could not partition by %s and order by %s: %s", partition_by, order_by, e)
+        return df
+    for spec in functions:
+        function = str(spec.get("function", "")).strip().lower()
+        function = "mean" if function == "avg" else function
+        column = spec.get("column")
+        new_col = spec.get("new_column") or (f"{column}_{function}" if column else function)
+        try:
+            if function in RANKING_FUNCTIONS:
+                result = _ranking(layout, function, spec)
+            elif function not in WINDOW_FUNCTIONS:
+                logger.warning("Window function '%s' not recognized.", function)
+                continue
+            elif not column:
+                logger.warning("Window function '%s' needs a column.", function)
+                continue
+            elif function in OFFSET_FUNCTIONS:
+                result = _offset_value(layout, function, layout.sorted_values(column, df), spec)
+            elif function in VALUE_FUNCTIONS:
+                result = _frame_value(layout, function, layout.sorted_values(column, df), spec)
+            else:
+                result = _frame_aggregate(layout, function, layout.sorted_values(column, df), spec)
+            df[new_col] = layout.scatter(result, df.index)
+        except Exception as e:
+            logger.error("Window function '%s' error for column %s: %s", function, column, e)
+    return df